@@ -0,0 +1,219 @@
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from vehicles.models import Vehicle
+from .models import Booking, VehicleBookingSlot
+
+
+# Bookings in these states no longer hold the vehicle
+INACTIVE_BOOKING_STATUSES = ('cancelled', 'completed')
+
+
+class VehicleUnavailable(Exception):
+    """Raised when a booking would overlap another active booking of the same vehicle."""
+
+
+def _parse_bound(value, is_end=False):
+    day = parse_date(value)
+    if day is not None:
+        # A plain date covers the whole day, so an end date runs until midnight
+        if is_end:
+            day += timedelta(days=1)
+        parsed = datetime.combine(day, time.min)
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f'Invalid date: {value}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_period(available_from, available_to):
+    """
+    Parse ``available_from``/``available_to`` values into an aware
+    ``(start, end)`` pair. Raises ``ValueError`` for malformed or empty periods.
+    """
+    start = _parse_bound(available_from)
+    end = _parse_bound(available_to, is_end=True)
+    if end <= start:
+        raise ValueError('available_to must be after available_from')
+    return start, end
+
+
+def touched_days(start, end):
+    """Inclusive ``(first, last)`` local dates touched by the period [start, end)."""
+    first = timezone.localdate(start)
+    last = timezone.localdate(end - timedelta(microseconds=1))
+    return first, max(first, last)
+
+
+def covered_days(start, end):
+    """Local dates whose whole day lies inside the period [start, end), in order."""
+    first = timezone.localdate(start)
+    if timezone.localtime(start).time() != time.min:
+        first += timedelta(days=1)
+    # The day ``end`` falls on is only covered up to ``end`` itself
+    last = timezone.localdate(end) - timedelta(days=1)
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def active_bookings():
+    return Booking.objects.exclude(status__in=INACTIVE_BOOKING_STATUSES)
+
+
+def overlapping_bookings(vehicle_id, start, end):
+    """Active bookings of the vehicle that overlap the half-open period [start, end)."""
+    return active_bookings().filter(
+        vehicle_id=vehicle_id,
+        booking_date__lt=end,
+        return_date__gt=start,
+    )
+
+
+def check_vehicle_availability(vehicle, start, end):
+    """
+    Check whether ``vehicle`` is free for [start, end).
+
+    Walks the vehicle's upcoming bookings in pickup order with a single query on
+    the ``(vehicle, booking_date, return_date)`` index. Conflicts form a prefix
+    of that walk, and the same pass finds the earliest gap long enough to fit
+    the requested duration, so the iteration stops as soon as both are known.
+    """
+    if not vehicle.is_rentable:
+        return {
+            'is_available': False,
+            'conflicting_bookings': [],
+            'next_available_window': None,
+        }
+
+    duration = end - start
+    candidate = start
+    conflicts = []
+    upcoming = active_bookings().filter(
+        vehicle_id=vehicle.pk,
+        return_date__gt=start,
+    ).order_by('booking_date').values(
+        'booking_id', 'booking_date', 'return_date', 'status'
+    )
+
+    for booking in upcoming.iterator():
+        if booking['booking_date'] >= candidate + duration:
+            break
+        if booking['booking_date'] < end:
+            conflicts.append(booking)
+        candidate = max(candidate, booking['return_date'])
+
+    return {
+        'is_available': not conflicts,
+        'conflicting_bookings': conflicts,
+        'next_available_window': {
+            'available_from': candidate,
+            'available_to': candidate + duration,
+        },
+    }
+
+
+def lock_vehicle(vehicle_id):
+    """
+    Lock the vehicle's row until the current transaction ends. Every write of
+    a booking takes it before touching the booking, so the writes of one
+    vehicle's bookings are applied one at a time.
+    """
+    list(Vehicle.objects.select_for_update().filter(pk=vehicle_id).values_list('pk', flat=True))
+
+
+def claim_vehicle_slots(booking):
+    """
+    Check that no other active booking of the vehicle overlaps the booking's
+    half-open period, the rule ``check_vehicle_availability`` applies, and
+    take one ``VehicleBookingSlot`` per local day the period covers whole.
+
+    The vehicle row is locked for the check so two bookings sharing a
+    partial day are decided one after the other, which lets one booking
+    return a vehicle in the morning and the next pick it up that afternoon.
+    The check is a locking read, so it sees bookings committed while this
+    transaction waited for the lock even under REPEATABLE READ. The unique ``(vehicle, day)`` constraint still rejects a second booking
+    of a whole day at insert time, whatever path wrote the first one. Any
+    slots the booking held before are replaced. Raises ``VehicleUnavailable``.
+    """
+    start, end = booking.booking_date, booking.return_date
+    message = f'Vehicle {booking.vehicle_id} is already booked between {start.isoformat()} and {end.isoformat()}'
+    try:
+        with transaction.atomic():
+            lock_vehicle(booking.vehicle_id)
+            clash = overlapping_bookings(booking.vehicle_id, start, end).exclude(
+                pk=booking.pk
+            ).select_for_update().values_list('pk', flat=True).first()
+            if clash is not None:
+                raise VehicleUnavailable(message)
+            VehicleBookingSlot.objects.filter(booking=booking).delete()
+            VehicleBookingSlot.objects.bulk_create([
+                VehicleBookingSlot(vehicle_id=booking.vehicle_id, day=day, booking=booking)
+                for day in covered_days(start, end)
+            ])
+    except IntegrityError:
+        raise VehicleUnavailable(message)
+
+
+def release_vehicle_slots(booking):
+    VehicleBookingSlot.objects.filter(booking=booking).delete()
+
+
+def with_next_booking(queryset):
+    """
+    Annotate bookings with the next active booking of the same vehicle and
+    the vehicle's day rate, so an extension check is a single query.
+    """
+    next_booking = active_bookings().filter(
+        vehicle_id=OuterRef('vehicle_id'),
+        booking_date__gte=OuterRef('return_date'),
+    ).exclude(pk=OuterRef('pk')).order_by('booking_date')
+    return queryset.annotate(
+        next_booking_id=Subquery(next_booking.values('booking_id')[:1]),
+        next_booking_date=Subquery(next_booking.values('booking_date')[:1]),
+        price_per_day=F('vehicle__price_per_day'),
+    )
+
+
+def extension_quote(booking, extend_return_date=None):
+    """
+    Latest date ``booking`` can be extended to and, for a requested date,
+    the extension length and price. ``booking`` must come from
+    ``with_next_booking``. The extension keeps the return time of day, so it
+    can end on the next booking's pickup day when that time is no later than
+    the pickup, and otherwise the day before. Cancelled and completed
+    bookings cannot be extended and are always quoted ``is_feasible: False``.
+    """
+    is_active = booking.status not in INACTIVE_BOOKING_STATUSES
+    current_return_date = timezone.localdate(booking.return_date)
+    max_extend_return_date = None
+    if booking.next_booking_date is not None:
+        next_pickup = timezone.localtime(booking.next_booking_date)
+        max_extend_return_date = next_pickup.date()
+        if timezone.localtime(booking.return_date).time() > next_pickup.time():
+            max_extend_return_date -= timedelta(days=1)
+
+    quote = {
+        'booking_id': booking.booking_id,
+        'current_return_date': current_return_date,
+        'max_extend_return_date': max_extend_return_date,
+        'next_booking_id': booking.next_booking_id,
+    }
+    if not is_active:
+        quote['is_feasible'] = False
+    if extend_return_date is not None:
+        no_of_extend_days = (extend_return_date - current_return_date).days
+        quote.update({
+            'extend_return_date': extend_return_date,
+            'no_of_extend_days': no_of_extend_days,
+            'price': booking.price_per_day * max(no_of_extend_days, 0),
+            'is_feasible': is_active and no_of_extend_days > 0 and (
+                max_extend_return_date is None or extend_return_date <= max_extend_return_date
+            ),
+        })
+    return quote
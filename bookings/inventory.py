@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+
+from vehicles.models import Vehicle
+from .models import Booking, VehicleLocationEvent
+
+BOOKING_EVENT_FIELDS = ['booking_id', 'vehicle_id', 'booking_date', 'return_date', 'dropoff_location_id', 'status']
+
+
+def booking_events(booking):
+    """Pickup and drop-off events of a booking given as a ``BOOKING_EVENT_FIELDS`` dict."""
+    if booking['status'] == 'cancelled':
+        return []
+    return [
+        VehicleLocationEvent(
+            vehicle_id=booking['vehicle_id'], booking_id=booking['booking_id'],
+            kind='pickup', at=booking['booking_date'], location_id=None,
+        ),
+        VehicleLocationEvent(
+            vehicle_id=booking['vehicle_id'], booking_id=booking['booking_id'],
+            kind='dropoff', at=booking['return_date'], location_id=booking['dropoff_location_id'],
+        ),
+    ]
+
+
+def refresh_booking_events(booking_id):
+    """Replace the events of one booking, so each booking change costs two row writes."""
+    booking = Booking.objects.filter(pk=booking_id).values(*BOOKING_EVENT_FIELDS).first()
+    with transaction.atomic():
+        VehicleLocationEvent.objects.filter(booking_id=booking_id).delete()
+        if booking is not None:
+            VehicleLocationEvent.objects.bulk_create(booking_events(booking))
+
+
+def rebuild_location_events():
+    """Replay every booking into the event table. Returns the number of events written."""
+    events = []
+    for booking in Booking.objects.values(*BOOKING_EVENT_FIELDS).iterator(chunk_size=2000):
+        events.extend(booking_events(booking))
+    with transaction.atomic():
+        VehicleLocationEvent.objects.all().delete()
+        VehicleLocationEvent.objects.bulk_create(events, batch_size=1000)
+    return len(events)
+
+
+def vehicle_locations(when):
+    """
+    Vehicles annotated with where they stand at ``when``: the location of
+    their latest event at or before it, found with one lookup per vehicle on
+    the ``(vehicle, at)`` index. Vehicles out on a booking, or never booked,
+    have no ``current_location_id``.
+    """
+    # A drop-off and the next pickup at the same moment leave the vehicle out
+    latest = VehicleLocationEvent.objects.filter(
+        vehicle_id=OuterRef('pk'), at__lte=when
+    ).order_by('-at', '-kind')
+    return Vehicle.objects.annotate(
+        current_location_id=Subquery(latest.values('location_id')[:1]),
+        located_since=Subquery(latest.values('at')[:1]),
+    )
+
+
+def vehicles_at(location_id, when):
+    return vehicle_locations(when).filter(current_location_id=location_id).order_by('vehicle_id')
+
+
+def inventory_counts(when):
+    """Number of vehicles standing at each location at ``when``."""
+    return vehicle_locations(when).filter(current_location_id__isnull=False).values(
+        'current_location_id'
+    ).annotate(vehicles=Count('pk')).order_by('current_location_id')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from bookings.inventory import rebuild_location_events
+
+
+class Command(BaseCommand):
+    help = 'Replay every booking into the vehicle location events behind the location inventory'
+
+    def handle(self, *args, **options):
+        count = rebuild_location_events()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} vehicle location events'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from bookings.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-vehicle occupancy bitmaps starting from today (run nightly to roll the horizon forward)'
+
+    def handle(self, *args, **options):
+        count = rebuild_occupancy()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt occupancy bitmaps for {count} vehicles'))
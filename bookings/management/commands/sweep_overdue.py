@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+from bookings.sweeper import sweep_overdue
+
+
+class Command(BaseCommand):
+    help = 'Mark ongoing bookings past their return date as overdue and accrue late fees'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep sweeping instead of exiting after one run')
+        parser.add_argument('--interval', type=int, default=3600, help='Seconds between sweeps with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            flipped, charged = sweep_overdue()
+            self.stdout.write(self.style.SUCCESS(
+                f'Marked {flipped} bookings overdue and charged {charged} late days'
+            ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
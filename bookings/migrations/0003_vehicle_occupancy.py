@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def build_occupancy(apps, schema_editor):
+    from bookings.occupancy import build_bitmap, horizon_days
+
+    Booking = apps.get_model('bookings', 'Booking')
+    VehicleOccupancy = apps.get_model('bookings', 'VehicleOccupancy')
+
+    origin = timezone.localdate()
+    horizon_start = timezone.make_aware(datetime.combine(origin, time.min))
+    horizon_end = horizon_start + timedelta(days=horizon_days())
+    periods = defaultdict(list)
+    rows = Booking.objects.exclude(status__in=['cancelled', 'completed']).filter(
+        booking_date__lt=horizon_end, return_date__gt=horizon_start
+    ).values_list('vehicle_id', 'booking_date', 'return_date')
+    for vehicle_id, start, end in rows.iterator():
+        periods[vehicle_id].append((start, end))
+
+    size = (horizon_days() + 7) // 8
+    VehicleOccupancy.objects.bulk_create([
+        VehicleOccupancy(
+            vehicle_id=vehicle_id,
+            start_date=origin,
+            bitmap=build_bitmap(origin, vehicle_periods).to_bytes(size, 'little'),
+        )
+        for vehicle_id, vehicle_periods in periods.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_vehicle_period_index'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleOccupancy',
+            fields=[
+                ('vehicle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='occupancy', serialize=False, to='vehicles.vehicle')),
+                ('start_date', models.DateField()),
+                ('bitmap', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'vehicle_occupancy',
+            },
+        ),
+        migrations.RunPython(build_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_vehicle_occupancy'),
+        ('customers', '0001_initial'),
+        ('drivers', '0001_initial'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['driver', 'booking_date', 'return_date'], name='bookings_driver_period_idx'),
+        ),
+    ]
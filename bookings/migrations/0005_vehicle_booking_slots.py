@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:26
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def claim_existing_slots(apps, schema_editor):
+    from bookings.availability import touched_days
+
+    Booking = apps.get_model('bookings', 'Booking')
+    VehicleBookingSlot = apps.get_model('bookings', 'VehicleBookingSlot')
+
+    bookings = Booking.objects.exclude(status__in=['cancelled', 'completed']).filter(
+        return_date__gt=timezone.now()
+    ).order_by('booking_date').values_list('booking_id', 'vehicle_id', 'booking_date', 'return_date')
+    slots = []
+    for booking_id, vehicle_id, start, end in bookings.iterator():
+        first, last = touched_days(start, end)
+        slots.extend(
+            VehicleBookingSlot(vehicle_id=vehicle_id, day=first + timedelta(days=offset), booking_id=booking_id)
+            for offset in range((last - first).days + 1)
+        )
+    # Bookings that already clash keep whichever claimed the day first
+    VehicleBookingSlot.objects.bulk_create(slots, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_driver_period_index'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleBookingSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vehicle_slots', to='bookings.booking')),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_slots', to='vehicles.vehicle')),
+            ],
+            options={
+                'db_table': 'vehicle_booking_slots',
+                'constraints': [models.UniqueConstraint(fields=('vehicle', 'day'), name='unique_vehicle_booking_slot')],
+            },
+        ),
+        migrations.RunPython(claim_existing_slots, migrations.RunPython.noop),
+    ]
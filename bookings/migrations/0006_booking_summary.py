@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_summaries(apps, schema_editor):
+    from bookings.projections import summary_fields
+
+    Booking = apps.get_model('bookings', 'Booking')
+    BookingSummary = apps.get_model('bookings', 'BookingSummary')
+
+    bookings = Booking.objects.select_related(
+        'customer', 'vehicle__sub_category', 'pickup_location', 'dropoff_location'
+    ).prefetch_related('add_ons').order_by('pk')
+    summaries = [
+        BookingSummary(booking=booking, **summary_fields(booking, list(booking.add_ons.all())))
+        for booking in bookings.iterator(chunk_size=1000)
+    ]
+    BookingSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_vehicle_booking_slots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingSummary',
+            fields=[
+                ('booking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='bookings.booking')),
+                ('booking_date', models.DateTimeField()),
+                ('return_date', models.DateTimeField()),
+                ('starting_odometer_reading', models.IntegerField()),
+                ('is_return_to_same_location', models.BooleanField(default=False)),
+                ('driving_type', models.CharField(max_length=20)),
+                ('no_of_passengers', models.IntegerField()),
+                ('fuel_responsibility', models.CharField(max_length=20)),
+                ('deposited_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('is_vat_applicable', models.BooleanField(default=False)),
+                ('insurance_type', models.CharField(max_length=20)),
+                ('insurance_value', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('discount_type', models.CharField(blank=True, max_length=20, null=True)),
+                ('discount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(db_index=True, max_length=20)),
+                ('customer_id', models.IntegerField(db_index=True)),
+                ('customer_first_name', models.CharField(max_length=100)),
+                ('customer_last_name', models.CharField(max_length=100)),
+                ('customer_contact_number', models.CharField(max_length=20)),
+                ('customer_nic', models.CharField(max_length=20)),
+                ('vehicle_id', models.IntegerField(db_index=True)),
+                ('vehicle_make', models.CharField(max_length=100)),
+                ('vehicle_model', models.CharField(max_length=100)),
+                ('vehicle_type', models.CharField(max_length=100)),
+                ('vehicle_registration_no', models.CharField(max_length=20)),
+                ('vehicle_price_per_day', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('vehicle_excess_km_charge', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('vehicle_vat_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('pickup_location_id', models.IntegerField()),
+                ('pickup_location_name', models.CharField(max_length=200)),
+                ('pickup_location_address', models.TextField()),
+                ('dropoff_location_id', models.IntegerField()),
+                ('dropoff_location_name', models.CharField(max_length=200)),
+                ('dropoff_location_address', models.TextField()),
+                ('add_ons', models.JSONField(default=list)),
+                ('add_ons_total', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'booking_summaries',
+            },
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
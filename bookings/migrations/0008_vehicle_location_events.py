@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def replay_bookings(apps, schema_editor):
+    Booking = apps.get_model('bookings', 'Booking')
+    VehicleLocationEvent = apps.get_model('bookings', 'VehicleLocationEvent')
+
+    events = []
+    bookings = Booking.objects.exclude(status='cancelled').values_list(
+        'booking_id', 'vehicle_id', 'booking_date', 'return_date', 'dropoff_location_id'
+    )
+    for booking_id, vehicle_id, start, end, dropoff_location_id in bookings.iterator():
+        events.append(VehicleLocationEvent(
+            vehicle_id=vehicle_id, booking_id=booking_id, kind='pickup', at=start, location_id=None
+        ))
+        events.append(VehicleLocationEvent(
+            vehicle_id=vehicle_id, booking_id=booking_id, kind='dropoff', at=end, location_id=dropoff_location_id
+        ))
+    VehicleLocationEvent.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_booking_late_fees'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleLocationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('pickup', 'Pickup'), ('dropoff', 'Drop-off')], max_length=10)),
+                ('at', models.DateTimeField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='location_events', to='bookings.booking')),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vehicle_events', to='bookings.location')),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='location_events', to='vehicles.vehicle')),
+            ],
+            options={
+                'db_table': 'vehicle_location_events',
+                'indexes': [models.Index(fields=['vehicle', 'at'], name='vehicle_location_event_idx')],
+            },
+        ),
+        migrations.RunPython(replay_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_vehicle_location_events'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookingsummary',
+            index=models.Index(fields=['created_at', 'booking'], name='booking_summaries_created_idx'),
+        ),
+    ]
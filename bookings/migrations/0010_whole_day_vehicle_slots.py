@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def release_partial_days(apps, schema_editor):
+    from bookings.availability import covered_days
+
+    Booking = apps.get_model('bookings', 'Booking')
+    VehicleBookingSlot = apps.get_model('bookings', 'VehicleBookingSlot')
+
+    bookings = Booking.objects.filter(vehicle_slots__isnull=False).distinct().values_list(
+        'booking_id', 'booking_date', 'return_date'
+    )
+    for booking_id, start, end in bookings.iterator():
+        # Partial pickup and return days are checked against the booking
+        # periods now, so only whole days keep a slot
+        VehicleBookingSlot.objects.filter(booking_id=booking_id).exclude(day__in=covered_days(start, end)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0009_created_at_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(release_partial_days, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from customers.models import Customer
 from vehicles.models import Vehicle
@@ -68,14 +69,41 @@ class Booking(models.Model):
     discount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    late_fee_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Last day already charged to late_fee_amount, maintained by bookings.sweeper
+    late_fee_accrued_until = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Booking {self.booking_id} - {self.customer.first_name} {self.customer.last_name}"
     
+    def clean(self):
+        # Reported as a form error here; saves that skip validation still
+        # fail in claim_vehicle_slots
+        from .availability import INACTIVE_BOOKING_STATUSES, overlapping_bookings
+        
+        if (
+            self.vehicle_id is None or self.booking_date is None or self.return_date is None
+            or self.status in INACTIVE_BOOKING_STATUSES
+        ):
+            return
+        if self.return_date <= self.booking_date:
+            raise ValidationError({'return_date': 'Return date must be after booking date'})
+        clash = overlapping_bookings(self.vehicle_id, self.booking_date, self.return_date).exclude(
+            pk=self.pk
+        ).values_list('booking_id', flat=True).first()
+        if clash is not None:
+            raise ValidationError({'vehicle': f'Vehicle is already booked by booking {clash} in this period'})
+    
     class Meta:
         db_table = 'bookings'
+        indexes = [
+            models.Index(fields=['vehicle', 'booking_date', 'return_date'], name='bookings_vehicle_period_idx'),
+            models.Index(fields=['driver', 'booking_date', 'return_date'], name='bookings_driver_period_idx'),
+            models.Index(fields=['status', 'return_date'], name='bookings_status_return_idx'),
+            models.Index(fields=['status', 'late_fee_accrued_until'], name='bookings_status_accrual_idx'),
+        ]
 
 
 class BookingAddOn(models.Model):
@@ -121,3 +149,125 @@ class BookingExtension(models.Model):
     class Meta:
         db_table = 'booking_extensions'
 
+
+
+class VehicleOccupancy(models.Model):
+    """
+    Per-vehicle day bitmap of active bookings. Bit ``i`` of ``bitmap`` (little
+    endian) is set when the vehicle is booked on ``start_date + i`` days.
+    Maintained by ``bookings.occupancy``; do not edit by hand.
+    """
+    vehicle = models.OneToOneField(Vehicle, on_delete=models.CASCADE, primary_key=True, related_name='occupancy')
+    start_date = models.DateField()
+    bitmap = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Occupancy for vehicle {self.vehicle_id} from {self.start_date}"
+    
+    class Meta:
+        db_table = 'vehicle_occupancy'
+
+
+class VehicleBookingSlot(models.Model):
+    """One row per vehicle and calendar day an active booking holds from midnight to midnight."""
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='booking_slots')
+    day = models.DateField()
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='vehicle_slots')
+    
+    def __str__(self):
+        return f"Vehicle {self.vehicle_id} on {self.day} - Booking {self.booking_id}"
+    
+    class Meta:
+        db_table = 'vehicle_booking_slots'
+        constraints = [
+            models.UniqueConstraint(fields=['vehicle', 'day'], name='unique_vehicle_booking_slot'),
+        ]
+
+
+class BookingSummary(models.Model):
+    """
+    Denormalized read model of a booking with its customer, vehicle, location
+    and add-on details, so list and detail views read a single table.
+    Maintained by ``bookings.projections``; do not edit by hand.
+    """
+    booking = models.OneToOneField(Booking, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    booking_date = models.DateTimeField()
+    return_date = models.DateTimeField()
+    starting_odometer_reading = models.IntegerField()
+    is_return_to_same_location = models.BooleanField(default=False)
+    driving_type = models.CharField(max_length=20)
+    no_of_passengers = models.IntegerField()
+    fuel_responsibility = models.CharField(max_length=20)
+    deposited_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    is_vat_applicable = models.BooleanField(default=False)
+    insurance_type = models.CharField(max_length=20)
+    insurance_value = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    discount_type = models.CharField(max_length=20, null=True, blank=True)
+    discount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, db_index=True)
+    late_fee_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    customer_id = models.IntegerField(db_index=True)
+    customer_first_name = models.CharField(max_length=100)
+    customer_last_name = models.CharField(max_length=100)
+    customer_contact_number = models.CharField(max_length=20)
+    customer_nic = models.CharField(max_length=20)
+    vehicle_id = models.IntegerField(db_index=True)
+    vehicle_make = models.CharField(max_length=100)
+    vehicle_model = models.CharField(max_length=100)
+    vehicle_type = models.CharField(max_length=100)
+    vehicle_registration_no = models.CharField(max_length=20)
+    vehicle_price_per_day = models.DecimalField(max_digits=10, decimal_places=2)
+    vehicle_excess_km_charge = models.DecimalField(max_digits=10, decimal_places=2)
+    vehicle_vat_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    pickup_location_id = models.IntegerField()
+    pickup_location_name = models.CharField(max_length=200)
+    pickup_location_address = models.TextField()
+    dropoff_location_id = models.IntegerField()
+    dropoff_location_name = models.CharField(max_length=200)
+    dropoff_location_address = models.TextField()
+    add_ons = models.JSONField(default=list)
+    add_ons_total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Summary of Booking {self.booking_id}"
+    
+    class Meta:
+        db_table = 'booking_summaries'
+        # Keyset paging key, see fleet360.pagination
+        indexes = [
+            models.Index(fields=['created_at', 'booking'], name='booking_summaries_created_idx'),
+        ]
+
+
+class VehicleLocationEvent(models.Model):
+    """
+    Pickups and drop-offs replayed from bookings. The latest event of a
+    vehicle at or before a moment tells where it stands: at ``location``
+    after a drop-off, out with a customer after a pickup. Maintained by
+    ``bookings.inventory``; do not edit by hand.
+    """
+    KIND_CHOICES = [
+        ('pickup', 'Pickup'),
+        ('dropoff', 'Drop-off'),
+    ]
+    
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='location_events')
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='location_events')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    at = models.DateTimeField()
+    # Where the vehicle stands after the event; empty while it is out on a booking
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, null=True, blank=True, related_name='vehicle_events')
+    
+    def __str__(self):
+        return f"Vehicle {self.vehicle_id} {self.kind} at {self.at}"
+    
+    class Meta:
+        db_table = 'vehicle_location_events'
+        indexes = [
+            models.Index(fields=['vehicle', 'at'], name='vehicle_location_event_idx'),
+        ]
@@ -0,0 +1,110 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .availability import active_bookings, touched_days
+from .models import VehicleOccupancy
+
+
+def horizon_days():
+    return settings.OCCUPANCY_HORIZON_DAYS
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _day_mask(origin, first, last):
+    lo = (first - origin).days
+    hi = (last - origin).days
+    return ((1 << (hi - lo + 1)) - 1) << lo
+
+
+def build_bitmap(origin, periods):
+    """Fold ``(booking_date, return_date)`` pairs into a day bitmap starting at ``origin``."""
+    horizon_end = origin + timedelta(days=horizon_days() - 1)
+    bits = 0
+    for start, end in periods:
+        first, last = touched_days(start, end)
+        first, last = max(first, origin), min(last, horizon_end)
+        if first <= last:
+            bits |= _day_mask(origin, first, last)
+    return bits
+
+
+def _to_bytes(bits):
+    return bits.to_bytes((horizon_days() + 7) // 8, 'little')
+
+
+def _horizon_bookings(origin):
+    return active_bookings().filter(
+        booking_date__lt=_day_start(origin + timedelta(days=horizon_days())),
+        return_date__gt=_day_start(origin),
+    )
+
+
+def refresh_vehicle_occupancy(vehicle_id):
+    """Recompute the bitmap of a single vehicle from its bookings in the horizon."""
+    origin = timezone.localdate()
+    periods = _horizon_bookings(origin).filter(vehicle_id=vehicle_id).values_list('booking_date', 'return_date')
+    VehicleOccupancy.objects.update_or_create(
+        vehicle_id=vehicle_id,
+        defaults={'start_date': origin, 'bitmap': _to_bytes(build_bitmap(origin, periods))},
+    )
+
+
+def rebuild_occupancy():
+    """Rebuild every bitmap from today's date in one pass. Returns the number of rows written."""
+    origin = timezone.localdate()
+    periods = defaultdict(list)
+    rows = _horizon_bookings(origin).values_list('vehicle_id', 'booking_date', 'return_date')
+    for vehicle_id, start, end in rows.iterator():
+        periods[vehicle_id].append((start, end))
+
+    occupancies = [
+        VehicleOccupancy(vehicle_id=vehicle_id, start_date=origin, bitmap=_to_bytes(build_bitmap(origin, vehicle_periods)))
+        for vehicle_id, vehicle_periods in periods.items()
+    ]
+    with transaction.atomic():
+        VehicleOccupancy.objects.all().delete()
+        VehicleOccupancy.objects.bulk_create(occupancies, batch_size=1000)
+    return len(occupancies)
+
+
+def busy_vehicle_ids(start, end):
+    """
+    Ids of vehicles with at least one active booking overlapping the
+    half-open period [start, end), the rule ``overlapping_bookings`` applies.
+
+    Reads every bitmap in one query and ANDs it against a day mask for the
+    window. The bitmaps mark whole days, so a hit only makes the vehicle a
+    candidate: a booking returned in the morning still marks the day of an
+    afternoon pickup. Candidates are confirmed with one interval query.
+    Vehicles without a bitmap have no bookings in their horizon. Rows whose
+    horizon does not cover the window are checked by the interval query too.
+    """
+    first, last = touched_days(start, end)
+    candidates = []
+    masks = {}
+
+    for vehicle_id, origin, bitmap in VehicleOccupancy.objects.values_list('vehicle_id', 'start_date', 'bitmap').iterator():
+        if first < origin or (last - origin).days >= horizon_days():
+            candidates.append(vehicle_id)
+            continue
+        if origin not in masks:
+            masks[origin] = _day_mask(origin, first, last)
+        if int.from_bytes(bitmap, 'little') & masks[origin]:
+            candidates.append(vehicle_id)
+
+    window = active_bookings().filter(booking_date__lt=end, return_date__gt=start)
+    today = timezone.localdate()
+    if first < today or (last - today).days >= horizon_days():
+        # The window reaches outside the maintained horizon, so vehicles
+        # without a bitmap may still have bookings there
+        return set(window.values_list('vehicle_id', flat=True).distinct())
+    if not candidates:
+        return set()
+    return set(window.filter(vehicle_id__in=candidates).values_list('vehicle_id', flat=True).distinct())
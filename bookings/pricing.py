@@ -0,0 +1,73 @@
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+# Vehicle columns needed to price a rental
+PRICING_FIELDS = [
+    'vehicle_id', 'vehicle_name', 'make', 'model', 'registration_no', 'price_per_day',
+    'base_km_per_day', 'excess_km_charge', 'vat_amount', 'deposit_amount',
+]
+
+
+def rental_days(start, end):
+    """Chargeable days for [start, end); any started day counts as a full day."""
+    return max(1, math.ceil((end - start) / timedelta(days=1)))
+
+
+def discount_amount(subtotal, discount_type=None, discount=None):
+    if not discount:
+        return ZERO
+    if discount_type == 'percentage':
+        return (subtotal * discount / 100).quantize(CENT)
+    return min(discount, subtotal)
+
+
+def quote_vehicles(vehicles, start, end, expected_km=0, add_ons_total=ZERO, discount_type=None,
+                   discount=None, insurance_value=None, is_vat_applicable=False):
+    """
+    Price a rental of [start, end) for every row of ``vehicles`` and return
+    the quotes sorted by total, cheapest first.
+
+    ``vehicles`` holds dicts with the ``PRICING_FIELDS`` columns, typically a
+    single ``.values(*PRICING_FIELDS)`` query over all candidates. Everything
+    that does not depend on the vehicle is computed once up front, so each
+    row costs a handful of Decimal operations.
+    """
+    days = rental_days(start, end)
+    insurance = insurance_value or ZERO
+    quotes = []
+
+    for vehicle in vehicles:
+        rental = vehicle['price_per_day'] * days
+        included_km = vehicle['base_km_per_day'] * days
+        excess_km = max(0, expected_km - included_km)
+        excess = vehicle['excess_km_charge'] * excess_km
+        subtotal = rental + excess + add_ons_total
+        discounted = discount_amount(subtotal, discount_type, discount)
+        vat = vehicle['vat_amount'] if is_vat_applicable else ZERO
+
+        quotes.append({
+            'vehicle_id': vehicle['vehicle_id'],
+            'vehicle_name': vehicle['vehicle_name'],
+            'make': vehicle['make'],
+            'model': vehicle['model'],
+            'registration_no': vehicle['registration_no'],
+            'rental_days': days,
+            'price_per_day': vehicle['price_per_day'],
+            'rental_amount': rental,
+            'included_km': included_km,
+            'excess_km': excess_km,
+            'excess_km_amount': excess,
+            'add_ons_amount': add_ons_total,
+            'discount_amount': discounted,
+            'insurance_amount': insurance,
+            'vat_amount': vat,
+            'total_amount': (subtotal - discounted + insurance + vat).quantize(CENT),
+            'deposit_amount': vehicle['deposit_amount'],
+        })
+
+    quotes.sort(key=lambda quote: (quote['total_amount'], quote['vehicle_id']))
+    return quotes
@@ -0,0 +1,96 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Booking, BookingSummary
+
+
+# Fields copied verbatim from the booking
+BOOKING_FIELDS = [
+    'booking_date', 'return_date', 'starting_odometer_reading', 'is_return_to_same_location',
+    'driving_type', 'no_of_passengers', 'fuel_responsibility', 'deposited_amount',
+    'is_vat_applicable', 'insurance_type', 'insurance_value', 'discount_type', 'discount',
+    'total_amount', 'status', 'late_fee_amount', 'created_at', 'updated_at',
+]
+
+
+def customer_fields(customer):
+    return {
+        'customer_first_name': customer.first_name,
+        'customer_last_name': customer.last_name,
+        'customer_contact_number': customer.contact_number,
+        'customer_nic': customer.nic,
+    }
+
+
+def vehicle_fields(vehicle):
+    return {
+        'vehicle_make': vehicle.make,
+        'vehicle_model': vehicle.model,
+        'vehicle_type': vehicle.sub_category.sub_category_name,
+        'vehicle_registration_no': vehicle.registration_no,
+        'vehicle_price_per_day': vehicle.price_per_day,
+        'vehicle_excess_km_charge': vehicle.excess_km_charge,
+        'vehicle_vat_amount': vehicle.vat_amount,
+    }
+
+
+def location_fields(prefix, location):
+    return {
+        f'{prefix}_name': location.name,
+        f'{prefix}_address': location.address,
+    }
+
+
+def summary_fields(booking, add_ons):
+    """Column values of the summary row for ``booking`` and its ``add_ons``."""
+    fields = {name: getattr(booking, name) for name in BOOKING_FIELDS}
+    fields.update(
+        customer_id=booking.customer_id,
+        vehicle_id=booking.vehicle_id,
+        pickup_location_id=booking.pickup_location_id,
+        dropoff_location_id=booking.dropoff_location_id,
+        add_ons=[
+            {'add_on_name': add_on.add_on_name, 'add_on_price': str(add_on.add_on_price)}
+            for add_on in add_ons
+        ],
+        add_ons_total=sum((add_on.add_on_price for add_on in add_ons), 0),
+        **customer_fields(booking.customer),
+        **vehicle_fields(booking.vehicle),
+        **location_fields('pickup_location', booking.pickup_location),
+        **location_fields('dropoff_location', booking.dropoff_location),
+    )
+    return fields
+
+
+def refresh_booking_summaries(booking_ids):
+    """Rebuild the summary rows of ``booking_ids`` with one read and one upsert."""
+    bookings = Booking.objects.filter(pk__in=booking_ids).select_related(
+        'customer', 'vehicle__sub_category', 'pickup_location', 'dropoff_location'
+    ).prefetch_related('add_ons')
+    summaries = [
+        BookingSummary(booking=booking, **summary_fields(booking, list(booking.add_ons.all())))
+        for booking in bookings
+    ]
+    if not summaries:
+        return
+
+    update_fields = [
+        field.name for field in BookingSummary._meta.concrete_fields if not field.primary_key
+    ]
+    # MySQL upserts on any unique key and does not accept an explicit target
+    unique_fields = ['booking'] if connection.features.supports_update_conflicts_with_target else None
+    BookingSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+def schedule_summary_refresh(booking_id):
+    transaction.on_commit(lambda: refresh_booking_summaries([booking_id]))
+
+
+def update_summaries(queryset, **fields):
+    """Push changed reference data into existing summaries with a single UPDATE."""
+    queryset.update(refreshed_at=timezone.now(), **fields)
@@ -0,0 +1,141 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from drivers.models import Driver
+from .availability import active_bookings
+from .models import Booking
+
+
+class DriverSchedule:
+    """
+    Busy intervals of each driver, kept sorted by start time.
+
+    Built from a single range query over active bookings with a driver, then
+    answers conflict checks with a binary search per driver instead of
+    re-reading the driver's bookings. Intervals may nest or overlap (bookings
+    assigned by hand are not checked), so alongside each list the running
+    maximum end time is kept and bounds how far back a search has to look.
+    """
+
+    def __init__(self, rows=()):
+        self._busy = defaultdict(list)
+        self._max_end = defaultdict(list)
+        for driver_id, start, end, booking_id in rows:
+            self._busy[driver_id].append((start, end, booking_id))
+        for driver_id, intervals in self._busy.items():
+            intervals.sort()
+            self._update_max_end(driver_id, 0)
+
+    def _update_max_end(self, driver_id, index):
+        intervals, max_end = self._busy[driver_id], self._max_end[driver_id]
+        del max_end[index:]
+        for _, end, _ in intervals[index:]:
+            max_end.append(end if not max_end or end > max_end[-1] else max_end[-1])
+
+    @classmethod
+    def for_period(cls, start, end, driver_ids=None):
+        bookings = active_bookings().filter(
+            driver__isnull=False,
+            booking_date__lt=end,
+            return_date__gt=start,
+        )
+        if driver_ids is not None:
+            bookings = bookings.filter(driver_id__in=driver_ids)
+        return cls(bookings.values_list('driver_id', 'booking_date', 'return_date', 'booking_id'))
+
+    def conflicts(self, driver_id, start, end):
+        """Booking ids of the driver that overlap [start, end)."""
+        intervals = self._busy.get(driver_id, [])
+        max_end = self._max_end.get(driver_id, [])
+        # Everything from this index on starts at or after ``end``, and once
+        # the running maximum end is at or before ``start`` nothing earlier
+        # can reach into the period either
+        index = bisect_left(intervals, (end,))
+        found = []
+        while index > 0 and max_end[index - 1] > start:
+            index -= 1
+            if intervals[index][1] > start:
+                found.append(intervals[index][2])
+        return found[::-1]
+
+    def is_free(self, driver_id, start, end):
+        return not self.conflicts(driver_id, start, end)
+
+    def _idle_gap(self, driver_id, start):
+        index = bisect_left(self._busy.get(driver_id, []), (start,))
+        if index == 0:
+            return None
+        return start - self._max_end[driver_id][index - 1]
+
+    def best_driver(self, driver_ids, start, end):
+        """
+        Best-fit choice among free drivers: the one whose previous job ends
+        closest before ``start``, so long idle stretches stay open for later
+        bookings. Drivers with nothing earlier in the schedule come last.
+        """
+        best, best_gap = None, None
+        for driver_id in driver_ids:
+            if not self.is_free(driver_id, start, end):
+                continue
+            gap = self._idle_gap(driver_id, start)
+            if best is None or (gap is not None and (best_gap is None or gap < best_gap)):
+                best, best_gap = driver_id, gap
+        return best
+
+    def reserve(self, driver_id, start, end, booking_id):
+        interval = (start, end, booking_id)
+        intervals = self._busy[driver_id]
+        index = bisect_left(intervals, interval)
+        intervals.insert(index, interval)
+        self._update_max_end(driver_id, index)
+
+
+def unassigned_driver_bookings():
+    return active_bookings().filter(driving_type='need_driver', driver__isnull=True)
+
+
+def auto_assign_drivers(bookings):
+    """
+    Assign free drivers to ``bookings`` (need_driver bookings without a driver).
+
+    Bookings are processed in pickup order and each takes the best-fit driver
+    from a schedule loaded once for the whole batch, while the bookings and
+    the available drivers are locked. Returns a mapping of
+    booking id to the assigned driver id, or None when nobody was free.
+    """
+    with transaction.atomic():
+        bookings = list(bookings.select_for_update().order_by('booking_date', 'booking_id'))
+        if not bookings:
+            return {}
+
+        # Lock the candidate drivers, in a fixed order, so a concurrent run
+        # waits here and then sees this run's assignments in the schedule
+        driver_ids = list(
+            Driver.objects.select_for_update().filter(is_available=True).order_by('driver_id')
+            .values_list('driver_id', flat=True)
+        )
+        schedule = DriverSchedule.for_period(
+            min(booking.booking_date for booking in bookings),
+            max(booking.return_date for booking in bookings),
+            driver_ids=driver_ids,
+        )
+
+        assignments = {}
+        now = timezone.now()
+        for booking in bookings:
+            driver_id = schedule.best_driver(driver_ids, booking.booking_date, booking.return_date)
+            assignments[booking.booking_id] = driver_id
+            if driver_id is None:
+                continue
+            schedule.reserve(driver_id, booking.booking_date, booking.return_date, booking.booking_id)
+            booking.driver_id = driver_id
+            booking.updated_at = now
+
+        Booking.objects.bulk_update(
+            [booking for booking in bookings if booking.driver_id],
+            ['driver', 'updated_at'],
+        )
+    return assignments
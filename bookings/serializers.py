@@ -1,5 +1,10 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import CharField, Value
 from rest_framework import serializers
-from .models import Booking, BookingAddOn, BookingReturn, BookingExtension, Location
+from .availability import VehicleUnavailable
+from .models import Booking, BookingAddOn, BookingReturn, BookingExtension, BookingSummary, Location
 from customers.models import Customer
 from vehicles.models import Vehicle
 from drivers.models import Driver
@@ -35,39 +40,97 @@ class BookingSerializer(serializers.ModelSerializer):
             'dropoff_location', 'starting_odometer_reading', 'is_return_to_same_location',
             'driving_type', 'no_of_passengers', 'fuel_responsibility', 'deposited_amount',
             'is_vat_applicable', 'insurance_type', 'insurance_value', 'discount_type',
-            'discount', 'total_amount', 'status', 'add_ons', 'pickup_location_id',
+            'discount', 'total_amount', 'status', 'late_fee_amount', 'add_ons', 'pickup_location_id',
             'dropoff_location_id', 'customer_id', 'vehicle_id', 'driver_id',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['booking_id', 'created_at', 'updated_at']
+        read_only_fields = ['booking_id', 'late_fee_amount', 'created_at', 'updated_at']
     
-    def create(self, validated_data):
-        add_ons_data = validated_data.pop('add_ons', [])
+    # Write-only id fields and the model each one points at
+    REFERENCE_FIELDS = {
+        'pickup_location_id': Location,
+        'dropoff_location_id': Location,
+        'customer_id': Customer,
+        'vehicle_id': Vehicle,
+        'driver_id': Driver,
+    }
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
         
-        # Get related objects
-        pickup_location = Location.objects.get(id=validated_data.pop('pickup_location_id'))
-        dropoff_location = Location.objects.get(id=validated_data.pop('dropoff_location_id'))
-        customer = Customer.objects.get(id=validated_data.pop('customer_id'))
-        vehicle = Vehicle.objects.get(id=validated_data.pop('vehicle_id'))
+        # Check every referenced row exists with one UNION query instead of a
+        # lookup per foreign key
+        requested = {
+            field: attrs[field] for field in self.REFERENCE_FIELDS
+            if attrs.get(field) is not None
+        }
+        ids_by_model = {}
+        for field, pk in requested.items():
+            ids_by_model.setdefault(self.REFERENCE_FIELDS[field], set()).add(pk)
         
-        driver_id = validated_data.pop('driver_id', None)
-        driver = None
-        if driver_id:
-            driver = Driver.objects.get(id=driver_id)
+        queries = [
+            model.objects.filter(pk__in=ids).annotate(
+                model_name=Value(model._meta.model_name, output_field=CharField())
+            ).values_list('pk', 'model_name')
+            for model, ids in ids_by_model.items()
+        ]
+        found = set(queries[0].union(*queries[1:], all=True)) if queries else set()
         
-        booking = Booking.objects.create(
-            pickup_location=pickup_location,
-            dropoff_location=dropoff_location,
-            customer=customer,
-            vehicle=vehicle,
-            driver=driver,
-            **validated_data
-        )
+        errors = {
+            field: [f'Invalid {field}: {pk} does not exist']
+            for field, pk in requested.items()
+            if (pk, self.REFERENCE_FIELDS[field]._meta.model_name) not in found
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
         
-        for add_on_data in add_ons_data:
-            BookingAddOn.objects.create(booking=booking, **add_on_data)
+        return attrs
+    
+    def create(self, validated_data):
+        add_ons_data = validated_data.pop('add_ons', [])
+        
+        # References were checked in validate(), so the *_id values are
+        # assigned directly. Vehicle-day slots are claimed by the booking's
+        # post_save handler, so a clash with another booking rolls the whole
+        # booking back.
+        try:
+            with transaction.atomic():
+                booking = Booking.objects.create(**validated_data)
+                BookingAddOn.objects.bulk_create([
+                    BookingAddOn(booking=booking, **add_on_data)
+                    for add_on_data in add_ons_data
+                ])
+        except VehicleUnavailable as e:
+            raise serializers.ValidationError({'vehicle_id': [str(e)]})
         
         return booking
+    
+    def update(self, instance, validated_data):
+        # A changed vehicle or period is re-checked by the post_save handler
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except VehicleUnavailable as e:
+            raise serializers.ValidationError({'vehicle_id': [str(e)]})
+
+
+class BookingQuoteSerializer(serializers.Serializer):
+    booking_date = serializers.DateTimeField()
+    return_date = serializers.DateTimeField()
+    expected_km = serializers.IntegerField(min_value=0, default=0)
+    add_ons = BookingAddOnSerializer(many=True, required=False)
+    discount_type = serializers.ChoiceField(choices=Booking.DISCOUNT_TYPE_CHOICES, required=False, allow_null=True)
+    discount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False, allow_null=True)
+    insurance_value = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False, allow_null=True)
+    is_vat_applicable = serializers.BooleanField(default=False)
+    vehicle_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    
+    def validate(self, attrs):
+        if attrs['return_date'] <= attrs['booking_date']:
+            raise serializers.ValidationError({'return_date': ['Return date must be after booking date']})
+        if attrs.get('discount_type') == 'percentage' and (attrs.get('discount') or 0) > 100:
+            raise serializers.ValidationError({'discount': ['Percentage discount cannot exceed 100']})
+        return attrs
 
 
 class BookingReturnSerializer(serializers.ModelSerializer):
@@ -86,6 +149,9 @@ class BookingExtensionSerializer(serializers.ModelSerializer):
             'original_return_date', 'extend_return_date',
             'no_of_extend_days', 'price'
         ]
+        # Derived from the booking when the extension is saved
+        read_only_fields = ['original_return_date', 'no_of_extend_days']
+        extra_kwargs = {'price': {'required': False}}
 
 
 class BookingDetailSerializer(serializers.ModelSerializer):
@@ -154,5 +220,92 @@ class BookingDetailSerializer(serializers.ModelSerializer):
             'tax': obj.vehicle.vat_amount,
             'deposit': obj.deposited_amount,
             'discount': obj.discount or 0,
+            'late_fee': obj.late_fee_amount,
+            'total_amount': obj.total_amount
+        }
+
+
+class BookingSummarySerializer(serializers.ModelSerializer):
+    """Renders a ``BookingSummary`` in the same shape as ``BookingSerializer``."""
+    booking_id = serializers.IntegerField(source='pk')
+    pickup_location = serializers.SerializerMethodField()
+    dropoff_location = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = BookingSummary
+        fields = [
+            'booking_id', 'booking_date', 'return_date', 'pickup_location',
+            'dropoff_location', 'starting_odometer_reading', 'is_return_to_same_location',
+            'driving_type', 'no_of_passengers', 'fuel_responsibility', 'deposited_amount',
+            'is_vat_applicable', 'insurance_type', 'insurance_value', 'discount_type',
+            'discount', 'total_amount', 'status', 'late_fee_amount', 'add_ons', 'created_at', 'updated_at'
+        ]
+    
+    def get_pickup_location(self, obj):
+        return {
+            'location_id': obj.pickup_location_id,
+            'name': obj.pickup_location_name,
+            'address': obj.pickup_location_address
+        }
+    
+    def get_dropoff_location(self, obj):
+        return {
+            'location_id': obj.dropoff_location_id,
+            'name': obj.dropoff_location_name,
+            'address': obj.dropoff_location_address
+        }
+
+
+class BookingSummaryDetailSerializer(BookingDetailSerializer):
+    """Renders a ``BookingSummary`` in the same shape as ``BookingDetailSerializer``."""
+    booking_id = serializers.IntegerField(source='pk')
+    
+    class Meta(BookingDetailSerializer.Meta):
+        model = BookingSummary
+    
+    def get_customer_information(self, obj):
+        return {
+            'customer_id': obj.customer_id,
+            'customer_first_name': obj.customer_first_name,
+            'customer_last_name': obj.customer_last_name,
+            'contact_number': obj.customer_contact_number,
+            'nic': obj.customer_nic
+        }
+    
+    def get_vehicle_information(self, obj):
+        return {
+            'vehicle_id': obj.vehicle_id,
+            'make': obj.vehicle_make,
+            'model': obj.vehicle_model,
+            'vehicle_type': obj.vehicle_type,
+            'registration_number': obj.vehicle_registration_no
+        }
+    
+    def get_location(self, obj):
+        return {
+            'pickup_location': {
+                'id': obj.pickup_location_id,
+                'name': obj.pickup_location_name,
+                'address': obj.pickup_location_address
+            },
+            'return_location': {
+                'id': obj.dropoff_location_id,
+                'name': obj.dropoff_location_name,
+                'address': obj.dropoff_location_address
+            }
+        }
+    
+    def get_price_breakdown(self, obj):
+        return {
+            'base_rate': obj.vehicle_price_per_day,
+            'add_ons': [
+                {'name': add_on['add_on_name'], 'price': Decimal(add_on['add_on_price'])}
+                for add_on in obj.add_ons
+            ],
+            'Excess rate': obj.vehicle_excess_km_charge,
+            'tax': obj.vehicle_vat_amount,
+            'deposit': obj.deposited_amount,
+            'discount': obj.discount or 0,
+            'late_fee': obj.late_fee_amount,
             'total_amount': obj.total_amount
         }
@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from customers.models import Customer
+from fleet360.caching import bump_version
+from fleet360.reference_data import invalidate_reference_data
+from vehicles.models import Vehicle, VehicleSubCategory
+from .availability import INACTIVE_BOOKING_STATUSES, claim_vehicle_slots, lock_vehicle, release_vehicle_slots
+from .inventory import refresh_booking_events
+from .models import Booking, BookingAddOn, BookingExtension, BookingSummary, Location
+from .occupancy import refresh_vehicle_occupancy
+from .projections import (
+    customer_fields, location_fields, schedule_summary_refresh, update_summaries, vehicle_fields
+)
+from .timeline import TIMELINE_NAMESPACE
+
+
+def _refresh_occupancy_on_commit(vehicle_id):
+    transaction.on_commit(lambda: refresh_vehicle_occupancy(vehicle_id))
+
+
+@receiver(pre_save, sender=Booking)
+def remember_previous_state(sender, instance, **kwargs):
+    # Lock the vehicle before anything in the transaction reads, so the
+    # stored values and the overlap check see the latest committed bookings.
+    # Saves outside a transaction are locked by claim_vehicle_slots alone.
+    if instance.status not in INACTIVE_BOOKING_STATUSES and transaction.get_connection().in_atomic_block:
+        lock_vehicle(instance.vehicle_id)
+    
+    # Handlers below need the stored values to tell what the save changed
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = Booking.objects.filter(pk=instance.pk).values(
+            'vehicle_id', 'booking_date', 'return_date', 'status',
+            'pickup_location_id', 'dropoff_location_id'
+        ).first()
+
+
+@receiver(post_save, sender=Booking)
+def sync_vehicle_slots(sender, instance, created, **kwargs):
+    # Runs inside the saving transaction so a clash aborts the save
+    if instance.status in INACTIVE_BOOKING_STATUSES:
+        release_vehicle_slots(instance)
+        return
+    previous = getattr(instance, '_previous_state', None)
+    if created or previous is None or any(
+        previous[field] != getattr(instance, field)
+        for field in ('vehicle_id', 'booking_date', 'return_date', 'status')
+    ):
+        claim_vehicle_slots(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_occupancy_on_booking_save(sender, instance, **kwargs):
+    _refresh_occupancy_on_commit(instance.vehicle_id)
+    previous = getattr(instance, '_previous_state', None)
+    if previous and previous['vehicle_id'] != instance.vehicle_id:
+        _refresh_occupancy_on_commit(previous['vehicle_id'])
+
+
+@receiver(post_delete, sender=Booking)
+def update_occupancy_on_booking_delete(sender, instance, **kwargs):
+    _refresh_occupancy_on_commit(instance.vehicle_id)
+
+
+@receiver(post_save, sender=BookingExtension)
+def update_occupancy_on_extension(sender, instance, **kwargs):
+    _refresh_occupancy_on_commit(instance.booking.vehicle_id)
+
+
+@receiver(post_save, sender=Booking)
+def refresh_summary_on_booking_save(sender, instance, **kwargs):
+    # Deferred to commit so add-ons written in the same transaction are included
+    schedule_summary_refresh(instance.pk)
+
+
+@receiver(post_save, sender=BookingAddOn)
+@receiver(post_delete, sender=BookingAddOn)
+def refresh_summary_on_add_on_change(sender, instance, **kwargs):
+    schedule_summary_refresh(instance.booking_id)
+
+
+@receiver(post_save, sender=Customer)
+def update_summaries_on_customer_save(sender, instance, created, **kwargs):
+    if not created:
+        update_summaries(BookingSummary.objects.filter(customer_id=instance.pk), **customer_fields(instance))
+
+
+@receiver(post_save, sender=Vehicle)
+def update_summaries_on_vehicle_save(sender, instance, created, **kwargs):
+    if not created:
+        update_summaries(BookingSummary.objects.filter(vehicle_id=instance.pk), **vehicle_fields(instance))
+
+
+@receiver(post_save, sender=VehicleSubCategory)
+def update_summaries_on_sub_category_save(sender, instance, created, **kwargs):
+    if not created:
+        vehicle_ids = Vehicle.objects.filter(sub_category=instance).values('pk')
+        update_summaries(
+            BookingSummary.objects.filter(vehicle_id__in=vehicle_ids),
+            vehicle_type=instance.sub_category_name,
+        )
+
+
+@receiver(post_save, sender=Location)
+def update_summaries_on_location_save(sender, instance, created, **kwargs):
+    if not created:
+        update_summaries(
+            BookingSummary.objects.filter(pickup_location_id=instance.pk),
+            **location_fields('pickup_location', instance)
+        )
+        update_summaries(
+            BookingSummary.objects.filter(dropoff_location_id=instance.pk),
+            **location_fields('dropoff_location', instance)
+        )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_locations(sender, instance, **kwargs):
+    invalidate_reference_data()
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+@receiver(post_save, sender=BookingExtension)
+@receiver(post_delete, sender=BookingExtension)
+@receiver(post_save, sender=Vehicle)
+@receiver(post_delete, sender=Vehicle)
+def invalidate_timeline(sender, instance, **kwargs):
+    # After commit, so a concurrent read cannot cache the uncommitted state
+    transaction.on_commit(lambda: bump_version(TIMELINE_NAMESPACE))
+
+
+@receiver(post_save, sender=Booking)
+def update_location_events(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_state', None)
+    if not created and previous is not None and all(
+        previous[field] == getattr(instance, field)
+        for field in ('vehicle_id', 'booking_date', 'return_date', 'dropoff_location_id')
+    ) and (previous['status'] == 'cancelled') == (instance.status == 'cancelled'):
+        return
+    booking_id = instance.pk
+    transaction.on_commit(lambda: refresh_booking_events(booking_id))
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+from django.dispatch import Signal
+from django.utils import timezone
+
+from fleet360.caching import bump_version
+from vehicles.models import Vehicle
+from .models import Booking, BookingSummary
+from .timeline import TIMELINE_NAMESPACE
+
+# Sent inside the sweep transaction with ``day``, the day accrual is now
+# complete up to. The UPDATEs bypass model signals, so projections of late
+# fees listen to this instead.
+late_fees_accrued = Signal()
+# Sent with ``booking_ids`` once those bookings are flipped to ``overdue``,
+# for projections that show the booking status.
+bookings_marked_overdue = Signal()
+
+
+def mark_overdue(now=None):
+    """
+    Flip every ``ongoing`` booking whose return date has passed to ``overdue``.
+    The ids are read from the ``(status, return_date)`` index and flipped
+    with one UPDATE, then sent with ``bookings_marked_overdue``. Late fees
+    accrue from the return day onwards. Returns the number of bookings flipped.
+    """
+    now = now or timezone.now()
+    booking_ids = list(
+        Booking.objects.filter(status='ongoing', return_date__lt=now).values_list('pk', flat=True)
+    )
+    if not booking_ids:
+        return 0
+    flipped = Booking.objects.filter(pk__in=booking_ids, status='ongoing').update(
+        status='overdue',
+        late_fee_accrued_until=TruncDate('return_date'),
+        updated_at=now,
+    )
+    bookings_marked_overdue.send(sender=Booking, booking_ids=booking_ids)
+    return flipped
+
+
+def accrue_late_fees(today=None):
+    """
+    Charge the vehicle's daily ``late_fee`` for every overdue day not yet
+    billed, up to and excluding ``today``.
+
+    Each statement bills one day for all bookings whose accrual stopped on
+    that day, so a nightly run is a single UPDATE and a missed night is
+    caught up one set-based UPDATE per day rather than per booking.
+    Returns the number of booking-days charged.
+    """
+    today = today or timezone.localdate()
+    overdue = Booking.objects.filter(status='overdue', late_fee_accrued_until__lt=today)
+    day = overdue.order_by('late_fee_accrued_until').values_list('late_fee_accrued_until', flat=True).first()
+    if day is None:
+        return 0
+
+    late_fee = Subquery(Vehicle.objects.filter(pk=OuterRef('vehicle_id')).values('late_fee')[:1])
+    now = timezone.now()
+    charged = 0
+    while day < today:
+        charged += overdue.filter(late_fee_accrued_until=day).update(
+            late_fee_amount=F('late_fee_amount') + late_fee,
+            late_fee_accrued_until=day + timedelta(days=1),
+            updated_at=now,
+        )
+        day += timedelta(days=1)
+    return charged
+
+
+def sync_overdue_summaries():
+    """Copy status and late fees of overdue bookings into their summaries in one UPDATE."""
+    booking = Booking.objects.filter(pk=OuterRef('booking_id'))
+    return BookingSummary.objects.filter(booking__status='overdue').update(
+        status='overdue',
+        late_fee_amount=Subquery(booking.values('late_fee_amount')[:1]),
+        updated_at=Subquery(booking.values('updated_at')[:1]),
+        refreshed_at=timezone.now(),
+    )
+
+
+def sweep_overdue():
+    with transaction.atomic():
+        flipped = mark_overdue()
+        charged = accrue_late_fees()
+        sync_overdue_summaries()
+        if charged:
+            late_fees_accrued.send(sender=Booking, day=timezone.localdate())
+    if flipped:
+        # Bulk updates skip the signals that invalidate the timeline
+        bump_version(TIMELINE_NAMESPACE)
+    return flipped, charged
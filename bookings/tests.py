@@ -1,4 +1,302 @@
-from django.test import TestCase
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
 
+from customers.models import Customer
+from vehicles.models import Vehicle, VehicleCategory, VehicleSubCategory
+from .models import Booking, BookingExtension, BookingSummary, Location, VehicleBookingSlot
+from .scheduling import DriverSchedule
+from .sweeper import accrue_late_fees, mark_overdue, sync_overdue_summaries
+
+
+class BookingTestCase(TransactionTestCase):
+    """A user, customer, location and vehicle to book, with payload helpers."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='counter', email='counter@example.com', password='secret')
+        self.location = Location.objects.create(name='Colombo', address='123 Main Street, Colombo 01')
+        self.customer = Customer.objects.create(
+            first_name='John', last_name='Doe', user_name='johndoe', email='john.doe@example.com',
+            contact_number='+94771234567', address='Colombo', nic='123456789V',
+            nationality='Sri Lankan', country='Sri Lanka'
+        )
+        category = VehicleCategory.objects.create(category_name='Car')
+        sub_category = VehicleSubCategory.objects.create(category=category, sub_category_name='Sedan')
+        self.vehicle = Vehicle.objects.create(
+            category=category, sub_category=sub_category, vehicle_name='Axio', engine_capacity=1500,
+            fuel_type='petrol', color='White', make='Toyota', model='Axio', transmission='auto',
+            price_per_day=Decimal('50.00'), no_of_seats=4, insurance_no='INS-1',
+            insurance_expiry=date(2030, 1, 1), registration_no='CAB-1234', vin='VIN-1',
+            base_km_per_day=100, excess_km_charge=Decimal('1.50'), registration_expiry=date(2030, 1, 1),
+            deposit_amount=Decimal('100.00'), late_fee=Decimal('20.00')
+        )
+
+    def booking_payload(self, start_offset, days):
+        start = timezone.now() + timedelta(days=start_offset)
+        return self.period_payload(start, start + timedelta(days=days))
+
+    def period_payload(self, start, end):
+        return {
+            'booking_date': start.isoformat(),
+            'return_date': end.isoformat(),
+            'pickup_location_id': self.location.location_id,
+            'dropoff_location_id': self.location.location_id,
+            'starting_odometer_reading': 1000,
+            'customer_id': self.customer.customer_id,
+            'vehicle_id': self.vehicle.vehicle_id,
+            'driving_type': 'self_drive',
+            'no_of_passengers': 2,
+            'fuel_responsibility': 'by_client',
+            'deposited_amount': '100.00',
+            'insurance_type': 'general',
+            'total_amount': '150.00',
+        }
+
+
+class ConcurrentBookingTests(BookingTestCase):
+    """Parallel creates for one vehicle must never double-book it."""
+
+    WORKERS = 8
+
+    def create_in_parallel(self, payloads):
+        barrier = threading.Barrier(len(payloads))
+
+        def create(payload):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            try:
+                barrier.wait()
+                return client.post('/api/bookings/', payload, format='json').status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            return list(executor.map(create, payloads))
+
+    def test_parallel_creates_for_same_dates_book_once(self):
+        codes = self.create_in_parallel([self.booking_payload(3, 2)] * self.WORKERS)
+
+        self.assertEqual(codes.count(201), 1)
+        self.assertEqual(codes.count(400), self.WORKERS - 1)
+        self.assertEqual(Booking.objects.filter(vehicle=self.vehicle).count(), 1)
+
+    def test_parallel_creates_for_disjoint_dates_all_succeed(self):
+        codes = self.create_in_parallel([self.booking_payload(3 * i, 1) for i in range(self.WORKERS)])
+
+        self.assertEqual(codes, [201] * self.WORKERS)
+        self.assertEqual(Booking.objects.filter(vehicle=self.vehicle).count(), self.WORKERS)
+
+    def test_cancelling_releases_the_vehicle(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = self.booking_payload(3, 2)
+        response = client.post('/api/bookings/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        booking = Booking.objects.get(pk=response.data['data']['booking_id'])
+        booking.status = 'cancelled'
+        booking.save()
+
+        self.assertFalse(VehicleBookingSlot.objects.filter(booking=booking).exists())
+        self.assertEqual(client.post('/api/bookings/', payload, format='json').status_code, 201)
+
+
+class BookingOverlapTests(BookingTestCase):
+    """Bookings of one vehicle may share a day but never overlap in time."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.day = timezone.localdate() + timedelta(days=5)
+
+    def at(self, days, hour):
+        return timezone.make_aware(datetime.combine(self.day + timedelta(days=days), time(hour)))
+
+    def book(self, start, end):
+        return self.client.post('/api/bookings/', self.period_payload(start, end), format='json')
+
+    def test_same_day_turnover_is_allowed(self):
+        first = self.book(self.at(0, 10), self.at(2, 10))
+        second = self.book(self.at(2, 14), self.at(4, 10))
+        back_to_back = self.book(self.at(-2, 10), self.at(0, 10))
+
+        self.assertEqual([first.status_code, second.status_code, back_to_back.status_code], [201, 201, 201])
+        self.assertEqual(
+            sorted(VehicleBookingSlot.objects.values_list('day', flat=True)),
+            [self.day - timedelta(days=1), self.day + timedelta(days=1), self.day + timedelta(days=3)],
+        )
+
+    def test_overlap_within_a_shared_day_is_rejected(self):
+        self.assertEqual(self.book(self.at(0, 10), self.at(2, 14)).status_code, 201)
+
+        response = self.book(self.at(2, 10), self.at(4, 10))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('vehicle_id', response.data)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_update_into_another_booking_is_a_client_error(self):
+        self.book(self.at(0, 10), self.at(2, 10))
+        booking_id = self.book(self.at(3, 10), self.at(4, 10)).data['data']['booking_id']
+
+        response = self.client.patch(
+            f'/api/bookings/{booking_id}/', {'booking_date': self.at(1, 10).isoformat()}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('vehicle_id', response.data)
+        self.assertEqual(Booking.objects.get(pk=booking_id).booking_date, self.at(3, 10))
+
+    def test_extension_can_end_on_the_next_pickup_day(self):
+        booking_id = self.book(self.at(0, 10), self.at(2, 10)).data['data']['booking_id']
+        self.book(self.at(4, 14), self.at(5, 10))
+
+        quote = self.client.get(f'/api/bookings/{booking_id}/extensions/').data['data']
+        self.assertEqual(quote['max_extend_return_date'], self.day + timedelta(days=4))
+
+        response = self.client.post(
+            f'/api/bookings/{booking_id}/extensions/', {'extend_return_date': self.day + timedelta(days=4)}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Booking.objects.get(pk=booking_id).return_date, self.at(4, 10))
+
+    def test_inactive_bookings_cannot_be_extended(self):
+        booking_id = self.book(self.at(0, 10), self.at(2, 10)).data['data']['booking_id']
+        booking = Booking.objects.get(pk=booking_id)
+        booking.status = 'cancelled'
+        booking.save()
+        url = f'/api/bookings/{booking_id}/extensions/'
+        extend_return_date = (self.day + timedelta(days=3)).isoformat()
+
+        self.assertFalse(self.client.get(url).data['data']['is_feasible'])
+        self.assertFalse(self.client.get(url, {'extend_return_date': extend_return_date}).data['data']['is_feasible'])
+
+        response = self.client.post(url, {'extend_return_date': extend_return_date}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(BookingExtension.objects.filter(booking_id=booking_id).exists())
+        self.assertEqual(Booking.objects.get(pk=booking_id).return_date, self.at(2, 10))
+
+    def test_model_validation_reports_the_clash(self):
+        self.book(self.at(0, 10), self.at(2, 10))
+        booking = Booking(
+            customer=self.customer, vehicle=self.vehicle, pickup_location=self.location,
+            dropoff_location=self.location, booking_date=self.at(1, 10), return_date=self.at(3, 10),
+        )
+
+        with self.assertRaises(ValidationError) as raised:
+            booking.clean()
+        self.assertIn('vehicle', raised.exception.message_dict)
+
+        booking.booking_date = self.at(2, 10)
+        booking.clean()
+
+
+class OverdueSweepTests(BookingTestCase):
+    """Overdue bookings are flipped, charged once per night and mirrored into their summaries."""
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+
+    def at(self, day, hour=10):
+        return timezone.make_aware(datetime.combine(day, time(hour)))
+
+    def book(self, first, last, status='ongoing'):
+        return Booking.objects.create(
+            booking_date=self.at(first), return_date=self.at(last), pickup_location=self.location,
+            dropoff_location=self.location, starting_odometer_reading=1000, customer=self.customer,
+            vehicle=self.vehicle, driving_type='self_drive', no_of_passengers=2, fuel_responsibility='by_client',
+            deposited_amount=Decimal('100.00'), insurance_type='general', total_amount=Decimal('150.00'),
+            status=status,
+        )
+
+    def test_only_ongoing_bookings_past_their_return_are_flipped(self):
+        late = self.book(self.today - timedelta(days=5), self.today - timedelta(days=3))
+        confirmed = self.book(self.today - timedelta(days=10), self.today - timedelta(days=8), status='confirmed')
+        on_time = self.book(self.today - timedelta(days=1), self.today + timedelta(days=2))
+
+        self.assertEqual(mark_overdue(), 1)
+
+        late.refresh_from_db()
+        self.assertEqual(late.status, 'overdue')
+        self.assertEqual(late.late_fee_accrued_until, self.today - timedelta(days=3))
+        self.assertEqual(Booking.objects.get(pk=confirmed.pk).status, 'confirmed')
+        self.assertEqual(Booking.objects.get(pk=on_time.pk).status, 'ongoing')
+
+    def test_missed_nights_are_caught_up(self):
+        three_nights = self.book(self.today - timedelta(days=5), self.today - timedelta(days=3))
+        one_night = self.book(self.today - timedelta(days=2), self.today - timedelta(days=1))
+        mark_overdue()
+
+        self.assertEqual(accrue_late_fees(), 4)
+
+        for booking, nights in ((three_nights, 3), (one_night, 1)):
+            booking.refresh_from_db()
+            self.assertEqual(booking.late_fee_amount, Decimal('20.00') * nights)
+            self.assertEqual(booking.late_fee_accrued_until, self.today)
+
+    def test_second_run_on_the_same_day_charges_nothing(self):
+        booking = self.book(self.today - timedelta(days=5), self.today - timedelta(days=2))
+        mark_overdue()
+
+        self.assertEqual(accrue_late_fees(), 2)
+        self.assertEqual(accrue_late_fees(), 0)
+        self.assertEqual(mark_overdue(), 0)
+
+        booking.refresh_from_db()
+        self.assertEqual(booking.late_fee_amount, Decimal('40.00'))
+
+        # The next night bills just that night
+        self.assertEqual(accrue_late_fees(today=self.today + timedelta(days=1)), 1)
+        booking.refresh_from_db()
+        self.assertEqual(booking.late_fee_amount, Decimal('60.00'))
+
+    def test_summaries_follow_the_sweep(self):
+        booking = self.book(self.today - timedelta(days=5), self.today - timedelta(days=2))
+        self.assertEqual(BookingSummary.objects.get(pk=booking.pk).status, 'ongoing')
+        mark_overdue()
+        accrue_late_fees()
+
+        self.assertEqual(sync_overdue_summaries(), 1)
+
+        summary = BookingSummary.objects.get(pk=booking.pk)
+        booking.refresh_from_db()
+        self.assertEqual(summary.status, 'overdue')
+        self.assertEqual(summary.late_fee_amount, Decimal('40.00'))
+        self.assertEqual(summary.updated_at, booking.updated_at)
+
+
+class DriverScheduleTests(SimpleTestCase):
+
+    def test_nested_interval_still_conflicts(self):
+        schedule = DriverSchedule([(1, 1, 10, 'A'), (1, 2, 3, 'B')])
+
+        self.assertEqual(schedule.conflicts(1, 5, 6), ['A'])
+        self.assertEqual(schedule.conflicts(1, 2, 4), ['A', 'B'])
+        self.assertEqual(schedule.conflicts(1, 10, 12), [])
+        self.assertFalse(schedule.is_free(1, 9, 11))
+
+    def test_reserve_keeps_overlapping_intervals_searchable(self):
+        schedule = DriverSchedule([(1, 0, 2, 'A')])
+        schedule.reserve(1, 4, 5, 'C')
+        schedule.reserve(1, 3, 20, 'B')
+
+        self.assertEqual(schedule.conflicts(1, 10, 11), ['B'])
+        self.assertEqual(schedule.conflicts(1, 1, 4), ['A', 'B'])
+        self.assertTrue(schedule.is_free(1, 2, 3))
+
+    def test_best_fit_measures_the_gap_from_the_latest_end(self):
+        schedule = DriverSchedule([(1, 0, 10, 'A'), (1, 1, 2, 'B'), (2, 8, 9, 'C')])
+
+        # Driver 1 looks like it freed up at 2 but is busy until 10
+        self.assertEqual(schedule.best_driver([1, 2], 11, 12), 1)
+        self.assertEqual(schedule.best_driver([1, 2], 9, 10), 2)
@@ -0,0 +1,104 @@
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.utils import timezone
+
+from fleet360.caching import get_or_compute, versioned_key
+from vehicles.models import Vehicle
+from .models import Booking
+
+# Cache namespace, bumped whenever bookings, extensions or vehicles change
+TIMELINE_NAMESPACE = 'bookings-timeline'
+
+
+def _extension_start(return_date, day):
+    # Extensions are stored as dates and run from the booking's return time on that day
+    return timezone.make_aware(datetime.combine(day, timezone.localtime(return_date).time()))
+
+
+def _booking_segments(booking_id, status, booking_date, return_date, extensions):
+    """Split one booking into its original period followed by one segment per extension."""
+    end = return_date
+    for _, extend_return_date in extensions:
+        end = max(end, _extension_start(return_date, extend_return_date))
+    splits = sorted({
+        _extension_start(return_date, original_return_date)
+        for original_return_date, _ in extensions
+    })
+    bounds = [booking_date, *(split for split in splits if booking_date < split < end), end]
+    return [
+        [bounds[index], bounds[index + 1], 'booking' if index == 0 else 'extension', booking_id, status]
+        for index in range(len(bounds) - 1)
+    ]
+
+
+def _merge_busy(segments):
+    """Sweep segments in start order and merge overlapping or touching ones."""
+    busy = []
+    for start, end, *_ in segments:
+        if busy and start <= busy[-1][1]:
+            busy[-1][1] = max(busy[-1][1], end)
+        else:
+            busy.append([start, end])
+    return busy
+
+
+def build_timeline(start, end, category=None):
+    """
+    Per-vehicle timeline of bookings, extensions and maintenance in [start, end).
+
+    Bookings and their extensions come from one range query (extensions are
+    left-joined, so a booking spans consecutive rows) ordered by vehicle, and
+    each vehicle's segments are swept once to clip them to the window and to
+    merge them into busy intervals. Segments are compact
+    ``[start, end, kind, booking_id, status]`` arrays.
+    """
+    vehicles = Vehicle.objects.order_by('vehicle_id')
+    bookings = Booking.objects.exclude(status='cancelled').filter(booking_date__lt=end, return_date__gt=start)
+    if category:
+        vehicles = vehicles.filter(category__category_name__iexact=category)
+        bookings = bookings.filter(vehicle__category__category_name__iexact=category)
+
+    rows = bookings.order_by(
+        'vehicle_id', 'booking_date', 'booking_id', 'extensions__original_return_date'
+    ).values_list(
+        'vehicle_id', 'booking_id', 'status', 'booking_date', 'return_date',
+        'extensions__original_return_date', 'extensions__extend_return_date',
+    )
+
+    segments = {}
+    for (vehicle_id, booking_id), booking_rows in groupby(rows.iterator(), key=itemgetter(0, 1)):
+        booking_rows = list(booking_rows)
+        _, _, status, booking_date, return_date, _, _ = booking_rows[0]
+        extensions = [(row[5], row[6]) for row in booking_rows if row[5] is not None]
+        for segment in _booking_segments(booking_id, status, booking_date, return_date, extensions):
+            segment[0], segment[1] = max(segment[0], start), min(segment[1], end)
+            if segment[0] < segment[1]:
+                segments.setdefault(vehicle_id, []).append(segment)
+
+    # Maintenance has no recorded period, so it is shown from now until the window ends
+    maintenance_from = max(start, timezone.now())
+    timeline = []
+    for vehicle_id, vehicle_name, registration_no, status, is_undermaintanace in vehicles.values_list(
+        'vehicle_id', 'vehicle_name', 'registration_no', 'status', 'is_undermaintanace'
+    ).iterator():
+        vehicle_segments = segments.get(vehicle_id, [])
+        if (is_undermaintanace or status == 'maintenance') and maintenance_from < end:
+            vehicle_segments.append([maintenance_from, end, 'maintenance', None, None])
+        vehicle_segments.sort(key=itemgetter(0, 1))
+        timeline.append({
+            'vehicle_id': vehicle_id,
+            'vehicle_name': vehicle_name,
+            'registration_no': registration_no,
+            'segments': vehicle_segments,
+            'busy': _merge_busy(vehicle_segments),
+        })
+
+    return {'start': start, 'end': end, 'category': category, 'vehicles': timeline}
+
+
+def cached_timeline(start, end, category=None):
+    key = versioned_key(TIMELINE_NAMESPACE, start.isoformat(), end.isoformat(), (category or '').lower())
+    return get_or_compute(key, lambda: build_timeline(start, end, category), settings.TIMELINE_CACHE_TIMEOUT)
@@ -5,8 +5,10 @@ from .views import BookingViewSet, LocationViewSet
 router = DefaultRouter()
 router.register(r'bookings', BookingViewSet)
 
+# Listed before the router so its booking detail route does not capture them
 urlpatterns = [
-    path('', include(router.urls)),
+    path('bookings/locations/inventory/', LocationViewSet.as_view({'get': 'inventory'}), name='booking-location-inventory'),
     path('bookings/locations/', LocationViewSet.as_view({'get': 'list'}), name='booking-locations'),
+    path('', include(router.urls)),
 ]
 
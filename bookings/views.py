@@ -1,22 +1,53 @@
+from datetime import datetime, time
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.db.models import Q
-from .models import Booking, BookingReturn, BookingExtension, Location
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from fleet360.conditional import conditional_get
+from fleet360.exports import StreamingExportMixin
+from fleet360.reference_data import reference_data
+from .availability import (
+    INACTIVE_BOOKING_STATUSES, VehicleUnavailable, extension_quote, lock_vehicle, parse_period, with_next_booking
+)
+from .inventory import inventory_counts, vehicles_at
+from .models import Booking, BookingReturn, BookingExtension, BookingSummary, Location
+from .scheduling import auto_assign_drivers, unassigned_driver_bookings
 from .serializers import (
     BookingSerializer, BookingReturnSerializer, BookingExtensionSerializer,
-    BookingDetailSerializer, LocationSerializer
+    BookingSummaryDetailSerializer, BookingSummarySerializer,
+    LocationSerializer
 )
+from .timeline import cached_timeline
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
+    export_filename = 'bookings'
+    export_fields = [
+        'booking_id', 'status', 'booking_date', 'return_date', 'customer_id', 'customer_first_name',
+        'customer_last_name', 'customer_contact_number', 'customer_nic', 'vehicle_id',
+        'vehicle_registration_no', 'vehicle_make', 'vehicle_model', 'pickup_location_name',
+        'dropoff_location_name', 'driving_type', 'deposited_amount', 'discount_type', 'discount',
+        'add_ons_total', 'late_fee_amount', 'total_amount', 'created_at'
+    ]
+    
+    # Summaries stamp refreshed_at whenever any of their copied data changes
+    conditional_field = 'refreshed_at'
     
     def get_queryset(self):
-        queryset = Booking.objects.all()
+        # Reads are served from the denormalized summary table
+        if self.action in ('list', 'retrieve', 'export'):
+            queryset = BookingSummary.objects.all()
+        else:
+            queryset = Booking.objects.all()
         booking_id = self.request.query_params.get('booking_id', None)
         customer_id = self.request.query_params.get('customer_id', None)
         date = self.request.query_params.get('date', None)
@@ -36,6 +67,13 @@ class BookingViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BookingSummarySerializer
+        if self.action == 'retrieve':
+            return BookingSummaryDetailSerializer
+        return BookingSerializer
+    
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -48,6 +86,7 @@ class BookingViewSet(viewsets.ModelViewSet):
             'code': 201
         }, status=status.HTTP_201_CREATED)
     
+    @conditional_get
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -68,9 +107,10 @@ class BookingViewSet(viewsets.ModelViewSet):
             'code': 200
         })
     
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        serializer = BookingDetailSerializer(instance)
+        serializer = self.get_serializer(instance)
         
         return Response({
             'data': serializer.data,
@@ -86,6 +126,10 @@ class BookingViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         return_obj = serializer.save(booking=booking)
         
+        # A returned vehicle no longer holds the rest of the booking period
+        booking.status = 'completed'
+        booking.save(update_fields=['status', 'updated_at'])
+        
         return Response({
             'data': serializer.data,
             'status': 'success',
@@ -93,12 +137,78 @@ class BookingViewSet(viewsets.ModelViewSet):
             'message': 'Booking has been returned successfully'
         })
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['get', 'post'])
     def extensions(self, request, pk=None):
-        booking = self.get_object()
+        
+        if request.method == 'GET':
+            booking = get_object_or_404(with_next_booking(self.get_queryset()), pk=pk)
+            extend_return_date = request.query_params.get('extend_return_date', None)
+            
+            if extend_return_date:
+                try:
+                    extend_return_date = parse_date(extend_return_date)
+                except ValueError:
+                    extend_return_date = None
+                if extend_return_date is None:
+                    return Response({
+                        'message': 'Invalid extend_return_date',
+                        'status': 'error',
+                        'code': 400
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            
+            return Response({
+                'data': extension_quote(booking, extend_return_date),
+                'status': 'success',
+                'code': 200,
+                'message': 'Booking extension details retrieved successfully'
+            })
+        
         serializer = BookingExtensionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        extension = serializer.save(booking=booking)
+        extend_return_date = serializer.validated_data['extend_return_date']
+        
+        try:
+            with transaction.atomic():
+                # Vehicle first, the order every booking write takes its locks
+                # in, then the booking so concurrent extensions are applied one
+                # at a time
+                vehicle_id = self.get_queryset().filter(pk=pk).values_list('vehicle_id', flat=True).first()
+                if vehicle_id is not None:
+                    lock_vehicle(vehicle_id)
+                booking = get_object_or_404(
+                    with_next_booking(self.get_queryset().select_for_update(of=('self',))), pk=pk
+                )
+                quote = extension_quote(booking, extend_return_date)
+                
+                if not quote['is_feasible']:
+                    if booking.status in INACTIVE_BOOKING_STATUSES:
+                        message = f'Booking {booking.booking_id} is {booking.status} and cannot be extended'
+                    else:
+                        message = f'Booking {booking.booking_id} cannot be extended to {extend_return_date}'
+                    return Response({
+                        'data': quote,
+                        'message': message,
+                        'status': 'error',
+                        'code': 409
+                    }, status=status.HTTP_409_CONFLICT)
+                
+                serializer.save(
+                    booking=booking,
+                    original_return_date=quote['current_return_date'],
+                    no_of_extend_days=quote['no_of_extend_days'],
+                    price=serializer.validated_data.get('price', quote['price'])
+                )
+                # Keep the return time of day on the new return date
+                booking.return_date = timezone.make_aware(datetime.combine(
+                    extend_return_date, timezone.localtime(booking.return_date).time()
+                ))
+                booking.save()
+        except VehicleUnavailable as e:
+            return Response({
+                'message': str(e),
+                'status': 'error',
+                'code': 409
+            }, status=status.HTTP_409_CONFLICT)
         
         return Response({
             'data': serializer.data,
@@ -106,6 +216,100 @@ class BookingViewSet(viewsets.ModelViewSet):
             'code': 200,
             'message': 'Booking extended successfully'
         })
+    
+    @action(detail=False, methods=['get'])
+    def timeline(self, request):
+        start_date = request.query_params.get('start_date', None)
+        end_date = request.query_params.get('end_date', None)
+        category = request.query_params.get('category', None)
+        
+        if not start_date or not end_date:
+            return Response({
+                'message': 'start_date and end_date are required',
+                'status': 'error',
+                'code': 400
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            start, end = parse_period(start_date, end_date)
+        except ValueError:
+            return Response({
+                'message': 'Invalid timeline range',
+                'status': 'error',
+                'code': 400
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'data': cached_timeline(start, end, category),
+            'message': 'Booking timeline retrieved successfully',
+            'status': 'success',
+            'code': 200
+        })
+    
+    @action(detail=True, methods=['post'])
+    def assign_driver(self, request, pk=None):
+        booking = self.get_object()
+        
+        if booking.driving_type != 'need_driver' or booking.driver_id:
+            return Response({
+                'message': f'Booking {booking.booking_id} does not need a driver assigned',
+                'status': 'error',
+                'code': 400
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        assignments = auto_assign_drivers(unassigned_driver_bookings().filter(pk=booking.pk))
+        driver_id = assignments.get(booking.pk)
+        
+        if driver_id is None:
+            return Response({
+                'message': f'No driver is free for booking {booking.booking_id}',
+                'status': 'error',
+                'code': 409
+            }, status=status.HTTP_409_CONFLICT)
+        
+        return Response({
+            'data': {'booking_id': booking.booking_id, 'driver_id': driver_id},
+            'status': 'success',
+            'code': 200,
+            'message': 'Driver assigned successfully'
+        })
+    
+    @action(detail=False, methods=['post'])
+    def assign_drivers(self, request):
+        # Defaults to every unassigned booking that has not ended yet
+        bookings = unassigned_driver_bookings()
+        available_from = request.data.get('available_from', None)
+        available_to = request.data.get('available_to', None)
+        
+        if available_from and available_to:
+            try:
+                start, end = parse_period(available_from, available_to)
+            except ValueError as e:
+                return Response({
+                    'message': str(e),
+                    'status': 'error',
+                    'code': 400
+                }, status=status.HTTP_400_BAD_REQUEST)
+            bookings = bookings.filter(booking_date__lt=end, return_date__gt=start)
+        else:
+            bookings = bookings.filter(return_date__gt=timezone.now())
+        
+        assignments = auto_assign_drivers(bookings)
+        
+        return Response({
+            'data': {
+                'assigned': [
+                    {'booking_id': booking_id, 'driver_id': driver_id}
+                    for booking_id, driver_id in assignments.items() if driver_id is not None
+                ],
+                'unassigned': [
+                    booking_id for booking_id, driver_id in assignments.items() if driver_id is None
+                ]
+            },
+            'status': 'success',
+            'code': 200,
+            'message': 'Drivers assigned successfully'
+        })
 
 
 class LocationViewSet(viewsets.ReadOnlyModelViewSet):
@@ -113,8 +317,7 @@ class LocationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = LocationSerializer
     
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(list(reference_data().locations.values()), many=True)
         
         return Response({
             'data': {'locations': serializer.data},
@@ -122,3 +325,49 @@ class LocationViewSet(viewsets.ReadOnlyModelViewSet):
             'code': 200,
             'message': 'Locations retrieved successfully'
         })
+    
+    def inventory(self, request, *args, **kwargs):
+        location_id = request.query_params.get('location_id', None)
+        at = request.query_params.get('at', None)
+        when = timezone.now()
+        
+        if at:
+            try:
+                day = parse_date(at)
+                when = timezone.make_aware(datetime.combine(day, time.min)) if day else parse_datetime(at)
+            except ValueError:
+                when = None
+            if when is None:
+                return Response({
+                    'message': 'Invalid at',
+                    'status': 'error',
+                    'code': 400
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(when):
+                when = timezone.make_aware(when)
+        
+        if location_id and not location_id.isdigit():
+            return Response({
+                'message': 'Invalid location_id',
+                'status': 'error',
+                'code': 400
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if location_id:
+            vehicles = vehicles_at(location_id, when).values(
+                'vehicle_id', 'vehicle_name', 'registration_no', 'located_since'
+            )
+            data = {'location_id': int(location_id), 'at': when, 'vehicles': list(vehicles)}
+        else:
+            names = dict(Location.objects.values_list('location_id', 'name'))
+            data = {'at': when, 'locations': [
+                {'location_id': row['current_location_id'], 'name': names.get(row['current_location_id']), 'vehicles': row['vehicles']}
+                for row in inventory_counts(when)
+            ]}
+        
+        return Response({
+            'data': data,
+            'status': 'success',
+            'code': 200,
+            'message': 'Location inventory retrieved successfully'
+        })
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['created_at', 'customer_id'], name='customers_created_idx'),
+        ),
+    ]
@@ -1,4 +1,120 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from fleet360.exports import EXPORT_CHUNK_SIZE
+from fleet360.typeahead import TYPEAHEAD_DEFAULT_LIMIT, TYPEAHEAD_MAX_LIMIT
+from .models import Customer
+
+
+class CustomerTypeaheadTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='fleet', password='secret'))
+
+    def customer(self, index, first_name='John', last_name='Doe', **kwargs):
+        fields = dict(
+            first_name=first_name, last_name=last_name, user_name=f'customer{index}',
+            email=f'customer{index}@example.com', contact_number=f'+94 77-{index:03d} 4567',
+            nic=f'{index:04d}56789v', address='Colombo', nationality='Sri Lankan', country='Sri Lanka',
+        )
+        fields.update(kwargs)
+        return Customer.objects.create(**fields)
+
+    def typeahead(self, query, **params):
+        response = self.client.get('/api/customers/typeahead/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [match['customer_id'] for match in response.data['data']]
+
+    def test_keys_are_normalized_on_save(self):
+        customer = self.customer(1, first_name=' Nimal ', last_name='DE  Silva')
+
+        self.assertEqual(customer.phone_key, '94770014567')
+        self.assertEqual(customer.nic_key, '000156789V')
+        self.assertEqual(customer.name_key, 'nimal de silva')
+        self.assertEqual(customer.last_name_key, 'de silva')
+
+    def test_phone_matches_whatever_the_separators(self):
+        customer = self.customer(1)
+        self.customer(2)
+
+        for query in ('+94 77-001', '94770014', '9477 0014 567'):
+            self.assertEqual(self.typeahead(query), [customer.pk])
+
+    def test_nic_matches_lower_case_v_and_separators(self):
+        customer = self.customer(1, nic='91234-5678v')
+        self.customer(2)
+
+        for query in ('912345678v', '91234-5678V', '9123 45'):
+            self.assertEqual(self.typeahead(query), [customer.pk])
+
+    def test_name_matches_first_and_last_name_prefixes(self):
+        nimal = self.customer(1, first_name='Nimal', last_name='Perera')
+        kamal = self.customer(2, first_name='Kamal', last_name='Silva')
+
+        self.assertEqual(self.typeahead('nim'), [nimal.pk])
+        self.assertEqual(self.typeahead('  NIMAL   per'), [nimal.pk])
+        self.assertEqual(self.typeahead('silv'), [kamal.pk])
+        self.assertEqual(self.typeahead('perera nimal'), [])
+        self.assertEqual(self.typeahead(' - '), [])
+
+    def test_limit_is_capped(self):
+        for index in range(TYPEAHEAD_MAX_LIMIT + 5):
+            self.customer(index)
+
+        self.assertEqual(len(self.typeahead('john', limit=3)), 3)
+        self.assertEqual(len(self.typeahead('john', limit=1000)), TYPEAHEAD_MAX_LIMIT)
+        self.assertEqual(len(self.typeahead('john', limit='many')), TYPEAHEAD_DEFAULT_LIMIT)
+
+    def test_keys_follow_partial_saves(self):
+        customer = self.customer(1)
+
+        customer.last_name = 'Fernando'
+        customer.contact_number = '071 222 3333'
+        customer.save(update_fields=['last_name', 'contact_number'])
+
+        customer.refresh_from_db()
+        self.assertEqual(customer.last_name_key, 'fernando')
+        self.assertEqual(customer.name_key, 'john fernando')
+        self.assertEqual(customer.phone_key, '0712223333')
+        self.assertEqual(self.typeahead('ferna'), [customer.pk])
+        self.assertEqual(self.typeahead('doe'), [])
+
+
+class CustomerExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='fleet', password='secret'))
+        Customer.objects.bulk_create([
+            Customer(
+                first_name='John', last_name=f'Doe {index}', user_name=f'customer{index}',
+                email=f'customer{index}@example.com', contact_number='+94771234567', nic=f'{index:09d}V',
+                address='Colombo', nationality='Sri Lankan', country='Sri Lanka',
+            )
+            for index in range(EXPORT_CHUNK_SIZE + 5)
+        ])
+        self.expected_ids = sorted(customer.pk for customer in Customer.objects.all())
+
+    def export(self, export_type):
+        # One keyset query per chunk, the last one short
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/customers/export/', {'type': export_type})
+            self.assertEqual(response.status_code, 200)
+            return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_streams_every_chunk(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+
+        self.assertEqual([int(row['customer_id']) for row in rows], self.expected_ids)
+        self.assertEqual(rows[-1]['last_name'], f'Doe {EXPORT_CHUNK_SIZE + 4}')
 
-# Create your tests here.
+    def test_ndjson_export_streams_every_chunk(self):
+        lines = self.export('ndjson').splitlines()
 
+        self.assertEqual([json.loads(line)['customer_id'] for line in lines], self.expected_ids)
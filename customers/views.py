@@ -3,14 +3,24 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
+from fleet360.conditional import conditional_get
+from fleet360.exports import StreamingExportMixin
+from fleet360.typeahead import TypeaheadMixin
 from .models import Customer
 from .serializers import CustomerSerializer, CustomerStatusSerializer
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(TypeaheadMixin, StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
+    typeahead_fields = ['customer_id', 'first_name', 'last_name', 'contact_number', 'nic', 'email', 'status']
+    export_filename = 'customers'
+    export_fields = [
+        'customer_id', 'first_name', 'last_name', 'user_name', 'email', 'contact_number', 'address',
+        'nic', 'passport_number', 'nationality', 'country', 'driving_licence_number', 'status',
+        'is_active', 'created_at'
+    ]
     
     def get_queryset(self):
         queryset = Customer.objects.all()
@@ -63,6 +73,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
             'message': 'Customer deleted successfully'
         })
     
+    @conditional_get
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -88,6 +99,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
             'code': 200
         })
     
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
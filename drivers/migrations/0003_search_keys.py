@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:43
+
+from django.db import migrations, models
+
+
+def fill_search_keys(apps, schema_editor):
+    from fleet360.typeahead import apply_search_keys
+
+    Driver = apps.get_model('drivers', 'Driver')
+    people = list(Driver.objects.all())
+    for person in people:
+        apply_search_keys(person)
+    Driver.objects.bulk_update(people, ['phone_key', 'nic_key', 'name_key', 'last_name_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0002_created_at_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driver',
+            name='last_name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='nic_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='phone_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
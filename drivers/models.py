@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from fleet360.typeahead import apply_search_keys
 
 
 class Driver(models.Model):
@@ -15,14 +16,30 @@ class Driver(models.Model):
     nationality = models.CharField(max_length=100)
     address = models.TextField()
     is_available = models.BooleanField(default=True)
+    # Normalized copies for typeahead prefix lookups, see fleet360.typeahead
+    phone_key = models.CharField(max_length=20, db_index=True, editable=False, default='')
+    nic_key = models.CharField(max_length=20, db_index=True, editable=False, default='')
+    name_key = models.CharField(max_length=201, db_index=True, editable=False, default='')
+    last_name_key = models.CharField(max_length=100, db_index=True, editable=False, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    def save(self, *args, **kwargs):
+        apply_search_keys(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'phone_key', 'nic_key', 'name_key', 'last_name_key'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
     
     class Meta:
         db_table = 'drivers'
+        # Keyset paging key, see fleet360.pagination
+        indexes = [
+            models.Index(fields=['created_at', 'driver_id'], name='drivers_created_idx'),
+        ]
 
 
 class DriverDocument(models.Model):
@@ -46,7 +46,17 @@ class DriverSerializer(serializers.ModelSerializer):
 
 
 class DriverAvailabilitySerializer(serializers.ModelSerializer):
+    is_available = serializers.SerializerMethodField()
+    conflicting_bookings = serializers.SerializerMethodField()
+    
     class Meta:
         model = Driver
-        fields = ['driver_id', 'is_available']
+        fields = ['driver_id', 'is_available', 'conflicting_bookings']
+    
+    def get_is_available(self, obj):
+        # Without a checked period only the driver's own flag applies
+        return obj.is_available and not self.context.get('conflicting_bookings')
+    
+    def get_conflicting_bookings(self, obj):
+        return self.context.get('conflicting_bookings', [])
 
@@ -1,4 +1,101 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from fleet360.typeahead import TYPEAHEAD_MAX_LIMIT
+from .models import Driver
+
+
+class DriverTypeaheadTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='fleet', password='secret'))
+
+    def driver(self, index, first_name='Sunil', last_name='Perera', **kwargs):
+        fields = dict(
+            first_name=first_name, last_name=last_name, email=f'driver{index}@example.com',
+            contact_number=f'+94 71-{index:03d} 4567', nic=f'{index:04d}56789v', address='Colombo',
+            nationality='Sri Lankan', country='Sri Lanka',
+        )
+        fields.update(kwargs)
+        return Driver.objects.create(**fields)
+
+    def typeahead(self, query, **params):
+        response = self.client.get('/api/drivers/typeahead/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [match['driver_id'] for match in response.data['data']]
+
+    def test_phone_and_nic_match_whatever_the_separators(self):
+        driver = self.driver(1, nic='91234-5678v')
+        self.driver(2)
+
+        self.assertEqual(self.typeahead('+94 71-001'), [driver.pk])
+        self.assertEqual(self.typeahead('912345678v'), [driver.pk])
+        self.assertEqual(self.typeahead('9123 45'), [driver.pk])
+
+    def test_name_matches_first_and_last_name_prefixes(self):
+        sunil = self.driver(1)
+        ruwan = self.driver(2, first_name='Ruwan', last_name='Silva')
+
+        self.assertEqual(self.typeahead('SUN'), [sunil.pk])
+        self.assertEqual(self.typeahead('sunil  per'), [sunil.pk])
+        self.assertEqual(self.typeahead('silva'), [ruwan.pk])
+
+    def test_limit_is_capped(self):
+        for index in range(TYPEAHEAD_MAX_LIMIT + 5):
+            self.driver(index)
+
+        self.assertEqual(len(self.typeahead('perera', limit=1000)), TYPEAHEAD_MAX_LIMIT)
+
+    def test_keys_follow_partial_saves(self):
+        driver = self.driver(1)
+
+        driver.first_name = 'Ajith'
+        driver.nic = '200012345678'
+        driver.save(update_fields=['first_name', 'nic'])
+
+        driver.refresh_from_db()
+        self.assertEqual(driver.name_key, 'ajith perera')
+        self.assertEqual(driver.nic_key, '200012345678')
+        self.assertEqual(self.typeahead('aji'), [driver.pk])
+        self.assertEqual(self.typeahead('2000 1234'), [driver.pk])
+
+
+class DriverCursorPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='fleet', password='secret'))
+
+    def test_pages_split_between_equal_timestamps_without_gaps_or_repeats(self):
+        drivers = [
+            Driver.objects.create(
+                first_name='Sunil', last_name='Perera', email=f'driver{index}@example.com',
+                contact_number='+94711234567', nic=f'{index:09d}V', address='Colombo',
+                nationality='Sri Lankan', country='Sri Lanka',
+            )
+            for index in range(8)
+        ]
+        # Rows 1-6 share a timestamp, so every boundary below falls inside the tie
+        now = timezone.now()
+        Driver.objects.filter(pk__in=[driver.pk for driver in drivers[1:7]]).update(created_at=now)
+        Driver.objects.filter(pk=drivers[0].pk).update(created_at=now - timedelta(hours=1))
+        Driver.objects.filter(pk=drivers[7].pk).update(created_at=now + timedelta(hours=1))
+        expected = [drivers[7].pk] + [driver.pk for driver in reversed(drivers[1:7])] + [drivers[0].pk]
 
-# Create your tests here.
+        pages, cursor = [], ''
+        while cursor is not None:
+            body = self.client.get('/api/drivers/', {'cursor': cursor, 'page_size': 3}).json()
+            pages.append([item['driver_id'] for item in body['data']])
+            cursor = body['pagination']['next_cursor']
+        self.assertEqual(pages, [expected[0:3], expected[3:6], expected[6:8]])
 
+        # Walking back from the last page returns the same pages
+        previous = body['pagination']['previous_cursor']
+        body = self.client.get('/api/drivers/', {'cursor': previous, 'page_size': 3}).json()
+        self.assertEqual([item['driver_id'] for item in body['data']], expected[3:6])
+        self.assertTrue(body['pagination']['has_next'])
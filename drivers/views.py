@@ -3,14 +3,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
+from bookings.availability import parse_period
+from bookings.scheduling import DriverSchedule
+from fleet360.conditional import conditional_get
+from fleet360.typeahead import TypeaheadMixin
 from .models import Driver
 from .serializers import DriverSerializer, DriverAvailabilitySerializer
 
 
-class DriverViewSet(viewsets.ModelViewSet):
+class DriverViewSet(TypeaheadMixin, viewsets.ModelViewSet):
     queryset = Driver.objects.all()
     serializer_class = DriverSerializer
     permission_classes = [IsAuthenticated]
+    typeahead_fields = ['driver_id', 'first_name', 'last_name', 'contact_number', 'nic', 'email', 'is_available']
     
     def get_queryset(self):
         queryset = Driver.objects.all()
@@ -63,6 +68,7 @@ class DriverViewSet(viewsets.ModelViewSet):
             'code': 200
         })
     
+    @conditional_get
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -83,6 +89,7 @@ class DriverViewSet(viewsets.ModelViewSet):
             'code': 200
         })
     
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -100,7 +107,21 @@ class DriverViewSet(viewsets.ModelViewSet):
         available_from = request.query_params.get('available_from', None)
         available_to = request.query_params.get('available_to', None)
         
-        serializer = DriverAvailabilitySerializer(driver)
+        context = {}
+        if available_from and available_to:
+            try:
+                start, end = parse_period(available_from, available_to)
+            except ValueError as e:
+                return Response({
+                    'message': str(e),
+                    'status': 'error',
+                    'code': 400
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            schedule = DriverSchedule.for_period(start, end, driver_ids=[driver.pk])
+            context['conflicting_bookings'] = schedule.conflicts(driver.pk, start, end)
+        
+        serializer = DriverAvailabilitySerializer(driver, context=context)
         
         return Response({
             'data': serializer.data,
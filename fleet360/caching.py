@@ -0,0 +1,163 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Computations in progress in this process, by key, see get_or_compute
+_flights = {}
+_flights_lock = threading.Lock()
+
+# Seconds between checks while another process computes a missing entry
+_WAIT_INTERVAL = 0.05
+
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+
+def get_version(namespace, using='default'):
+    """
+    Current version of ``namespace``; cached entries carry it in their key.
+    Keep the counter in the cache alias ``using`` that holds the entries, so
+    it lives at least as long as they do.
+    """
+    store = caches[using]
+    version = store.get(_version_key(namespace))
+    if version is None:
+        store.add(_version_key(namespace), 1, timeout=None)
+        version = store.get(_version_key(namespace), 1)
+    return version
+
+
+def bump_version(namespace, using='default'):
+    """
+    Invalidate every entry of ``namespace`` at once. Old entries are never
+    read again and simply expire.
+    """
+    store = caches[using]
+    try:
+        store.incr(_version_key(namespace))
+    except ValueError:
+        store.add(_version_key(namespace), 2, timeout=None)
+
+
+def versioned_key(namespace, *parts, using='default'):
+    return ':'.join([namespace, str(get_version(namespace, using)), *(str(part) for part in parts)])
+
+
+def tiered_get(key):
+    """
+    Read ``key`` from the per-process ``local`` cache, falling back to the
+    ``shared`` one and copying a hit into the local tier for
+    ``LOCAL_CACHE_TIMEOUT`` seconds. Build ``key`` with
+    ``versioned_key(..., using='shared')`` so both tiers drop it on a bump.
+    """
+    value = caches['local'].get(key)
+    if value is None:
+        value = caches['shared'].get(key)
+        if value is not None:
+            caches['local'].set(key, value, settings.LOCAL_CACHE_TIMEOUT)
+    return value
+
+
+def tiered_set(key, value, timeout):
+    caches['shared'].set(key, value, timeout)
+    caches['local'].set(key, value, min(timeout, settings.LOCAL_CACHE_TIMEOUT))
+
+
+class _Flight:
+    """One in-process computation of a key that other threads can wait on."""
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.done = threading.Event()
+        self.succeeded = False
+        self.value = None
+
+
+def get_or_compute(key, compute, timeout, using='default', tiered=False):
+    """
+    Read-through cache that runs ``compute()`` once per key however many
+    requests miss together. Entries stay fresh for ``timeout`` seconds and
+    are kept ``CACHE_STALE_TIMEOUT`` seconds longer. While one caller
+    refreshes a stale entry, the others are served the stale value; when
+    there is nothing to serve they wait for the refresh, up to
+    ``CACHE_LOCK_TIMEOUT`` seconds.
+
+    Threads of a process wait on the first one's in-flight computation of
+    the key, processes on a ``cache.add`` mutex in ``using``. No lock is
+    held while ``compute()`` runs, so it may itself call ``get_or_compute``.
+    With ``tiered`` entries are read and written through
+    ``tiered_get``/``tiered_set`` and the mutex lives in ``shared``.
+    Entries are wrapped with their freshness and kept under
+    ``computed:<key>``, apart from plain values stored under ``key``.
+    """
+    if tiered:
+        using = 'shared'
+        read, write = tiered_get, tiered_set
+    else:
+        read, write = caches[using].get, caches[using].set
+    mutex = caches[using]
+    lock_key = f'lock:{key}'
+    key = f'computed:{key}'
+
+    def refresh():
+        value = compute()
+        write(key, {'value': value, 'fresh_until': time.time() + timeout}, timeout + settings.CACHE_STALE_TIMEOUT)
+        return value
+
+    entry = read(key)
+    if entry is not None and entry['fresh_until'] > time.time():
+        return entry['value']
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leading = flight is None
+        if leading:
+            flight = _flights[key] = _Flight()
+    if not leading:
+        if flight.owner == threading.get_ident():
+            # compute() asked for its own key again
+            return compute()
+        if entry is not None:
+            # Another thread of this process is refreshing it
+            return entry['value']
+        if flight.done.wait(settings.CACHE_LOCK_TIMEOUT) and flight.succeeded:
+            return flight.value
+        # That computation failed or timed out
+        return refresh()
+
+    try:
+        flight.value = _compute_once(key, lock_key, entry, read, mutex, refresh)
+        flight.succeeded = True
+        return flight.value
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def _compute_once(key, lock_key, entry, read, mutex, refresh):
+    """Refresh ``key`` unless another process holds its mutex, then serve or wait for theirs."""
+    entry = read(key) or entry
+    if entry is not None and entry['fresh_until'] > time.time():
+        return entry['value']
+
+    if mutex.add(lock_key, 1, settings.CACHE_LOCK_TIMEOUT):
+        try:
+            return refresh()
+        finally:
+            mutex.delete(lock_key)
+    if entry is not None:
+        return entry['value']
+
+    # Another process is computing it
+    deadline = time.time() + settings.CACHE_LOCK_TIMEOUT
+    while time.time() < deadline and mutex.get(lock_key) is not None:
+        time.sleep(_WAIT_INTERVAL)
+    entry = read(key)
+    if entry is not None:
+        return entry['value']
+    # That computation failed or timed out
+    return refresh()
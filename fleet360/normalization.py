@@ -0,0 +1,29 @@
+import re
+
+_TOKEN_RE = re.compile(r'[0-9a-z]+')
+_NON_ALNUM_RE = re.compile(r'[^0-9A-Za-z]')
+
+
+def search_tokens(text):
+    """Lower-cased alphanumeric words of ``text``, in order and without duplicates."""
+    return list(dict.fromkeys(_TOKEN_RE.findall((text or '').lower())))
+
+
+def normalize_registration(value):
+    """Registration number with separators removed, e.g. ``cab-1234`` -> ``CAB1234``."""
+    return _NON_ALNUM_RE.sub('', value or '').upper()
+
+
+def normalize_phone(value):
+    """Digits of a phone number, e.g. ``+94 77-123 4567`` -> ``94771234567``."""
+    return re.sub(r'\D', '', value or '')
+
+
+def normalize_nic(value):
+    """NIC upper-cased without separators, e.g. ``91234-5678v`` -> ``912345678V``."""
+    return _NON_ALNUM_RE.sub('', value or '').upper()
+
+
+def normalize_name(*parts):
+    """Lower-cased name with single spaces, e.g. ``('John ', 'DOE')`` -> ``john doe``."""
+    return ' '.join(' '.join(part or '' for part in parts).lower().split())
@@ -1,24 +1,164 @@
+import base64
+import binascii
+import hashlib
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from .caching import get_or_compute
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator whose total is cached for ``PAGINATION_COUNT_CACHE_TIMEOUT``
+    seconds, keyed by the compiled filter SQL so equivalent requests share it.
+    """
+    
+    @cached_property
+    def count(self):
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.md5(repr((self.object_list.model._meta.label, sql, params)).encode()).hexdigest()
+        return get_or_compute(
+            f'pagination-count:{digest}', lambda: super(CachedCountPaginator, self).count,
+            settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
     
+    # Opt-in keyset paging: ``?cursor=`` for the first page, then the returned cursors
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-created_at', '-pk')
+    invalid_cursor_message = 'Invalid cursor.'
+    
+    # ``?count=false`` skips the total, ``?count=estimate`` serves a cached one
+    count_query_param = 'count'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        self.count_mode = request.query_params.get(self.count_query_param, 'exact').lower()
+        if self.cursor_query_param in request.query_params:
+            return self.paginate_queryset_by_cursor(queryset, request)
+        if self.count_mode == 'false':
+            return self.paginate_queryset_without_count(queryset, request)
+        if self.count_mode == 'estimate':
+            self.django_paginator_class = CachedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+    
+    def paginate_queryset_without_count(self, queryset, request):
+        """Page-number paging that reads ``page_size + 1`` rows to find ``has_next`` instead of counting."""
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.page_number, message='Invalid page.'))
+        
+        offset = (self.page_number - 1) * self.page_size_value
+        rows = list(queryset[offset:offset + self.page_size_value + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.page_number, message='That page contains no results'))
+        self.has_next = len(rows) > self.page_size_value
+        return rows[:self.page_size_value]
+    
+    def paginate_queryset_by_cursor(self, queryset, request):
+        """
+        Page on the ``(created_at, pk)`` key instead of OFFSET. Each page is
+        an index range scan of ``page_size + 1`` rows, with the extra row
+        telling whether another page follows, and no COUNT is run.
+        """
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request.query_params[self.cursor_query_param])
+        
+        queryset = queryset.order_by(*self.cursor_ordering)
+        reverse = False
+        if self.cursor is not None:
+            created_at, pk, reverse = self.cursor
+            if reverse:
+                # Walk backwards from the first row of the current page
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+                ).order_by('created_at', 'pk')
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+                )
+        
+        rows = list(queryset[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.page_rows = rows
+        return rows
+    
+    def encode_cursor(self, row, reverse=False):
+        token = f"{'p' if reverse else 'n'}|{row.created_at.isoformat()}|{row.pk}"
+        return base64.urlsafe_b64encode(token.encode()).decode()
+    
+    def decode_cursor(self, value):
+        if not value:
+            return None
+        try:
+            direction, created_at, pk = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None or direction not in ('n', 'p'):
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk, direction == 'p'
+    
+    def get_cursor_pagination(self):
+        rows = self.page_rows
+        return {
+            'next_cursor': self.encode_cursor(rows[-1]) if rows and self.has_next else None,
+            'previous_cursor': self.encode_cursor(rows[0], reverse=True) if rows and self.has_previous else None,
+            'items_per_page': self.page_size_value,
+            'has_next': self.has_next,
+            'has_previous': self.has_previous
+        }
+    
     def get_paginated_response(self, data):
-        return Response({
-            'data': data,
-            'pagination': {
+        if self.cursor_query_param in self.request.query_params:
+            pagination = self.get_cursor_pagination()
+        elif self.count_mode == 'false':
+            pagination = {
+                'current_page': self.page_number,
+                'total_pages': None,
+                'total_items': None,
+                'items_per_page': self.page_size_value,
+                'has_next': self.has_next,
+                'has_previous': self.page_number > 1
+            }
+        else:
+            pagination = {
                 'current_page': self.page.number,
                 'total_pages': self.page.paginator.num_pages,
                 'total_items': self.page.paginator.count,
                 'items_per_page': self.page.paginator.per_page,
                 'has_next': self.page.has_next(),
                 'has_previous': self.page.has_previous()
-            },
+            }
+        return Response({
+            'data': data,
+            'pagination': pagination,
             'message': 'Data retrieved successfully',
             'status': 'success',
             'code': 200
-        })
\ No newline at end of file
+        })
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from .caching import bump_version, get_version
+
+REFERENCE_DATA_NAMESPACE = 'reference-data'
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def _as_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ReferenceData:
+    """
+    Process-local snapshot of vehicle categories, sub-categories and
+    locations. Treat the instances as read-only, they are shared by every
+    request of the process.
+    """
+
+    def __init__(self, version):
+        from bookings.models import Location
+        from vehicles.models import VehicleCategory, VehicleSubCategory
+
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.categories = {row.pk: row for row in VehicleCategory.objects.order_by('pk')}
+        self.sub_categories = {row.pk: row for row in VehicleSubCategory.objects.order_by('pk')}
+        self.locations = {row.pk: row for row in Location.objects.order_by('pk')}
+
+        # Names are not unique, so a name resolves to every matching id
+        self.category_ids_by_name = {}
+        for row in self.categories.values():
+            self.category_ids_by_name.setdefault(row.category_name.strip().lower(), []).append(row.pk)
+        self.sub_category_ids_by_name = {}
+        for row in self.sub_categories.values():
+            self.sub_category_ids_by_name.setdefault(row.sub_category_name.strip().lower(), []).append(row.pk)
+
+    def category(self, pk):
+        return self.categories.get(_as_pk(pk))
+
+    def sub_category(self, pk):
+        return self.sub_categories.get(_as_pk(pk))
+
+    def location(self, pk):
+        return self.locations.get(_as_pk(pk))
+
+    def category_ids(self, name):
+        return self.category_ids_by_name.get(name.strip().lower(), [])
+
+    def sub_category_ids(self, name):
+        return self.sub_category_ids_by_name.get(name.strip().lower(), [])
+
+
+def reference_data():
+    """
+    Current snapshot, reloaded when the version counter has moved. The
+    counter lives in the ``shared`` cache so a write in one worker reaches
+    every worker. Each call costs one cache read of the version instead of a
+    query. Snapshots older than ``REFERENCE_DATA_MAX_AGE`` seconds are
+    reloaded anyway, in case the counter itself was evicted.
+    """
+    global _snapshot
+
+    def current(snapshot):
+        return (
+            snapshot is not None and snapshot.version == version
+            and time.monotonic() - snapshot.loaded_at < settings.REFERENCE_DATA_MAX_AGE
+        )
+
+    version = get_version(REFERENCE_DATA_NAMESPACE, using='shared')
+    snapshot = _snapshot
+    if not current(snapshot):
+        with _lock:
+            snapshot = _snapshot
+            if not current(snapshot):
+                snapshot = _snapshot = ReferenceData(version)
+    return snapshot
+
+
+def invalidate_reference_data():
+    """Bump the version once the current transaction commits so every process reloads."""
+    transaction.on_commit(lambda: bump_version(REFERENCE_DATA_NAMESPACE, using='shared'))
+
+
+def warm_reference_data():
+    """Load the snapshot at startup; skipped while the tables do not exist yet."""
+    try:
+        reference_data()
+    except DatabaseError:
+        pass
+
+
+class ReferenceRelatedField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` that resolves the pk through the reference-data snapshot."""
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instance = getattr(reference_data(), self.kind)(data)
+        if instance is None:
+            if _as_pk(data) is None:
+                self.fail('incorrect_type', data_type=type(data).__name__)
+            self.fail('does_not_exist', pk_value=data)
+        return instance
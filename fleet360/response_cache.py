@@ -0,0 +1,83 @@
+import hashlib
+from functools import wraps
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .caching import get_or_compute, versioned_key
+
+# Validators set by fleet360.conditional, replayed on every hit
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+class _Uncached(Exception):
+    """Carries a response that must not be cached, such as a 304 or an error, out of ``get_or_compute``."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def response_cache_key(view, request):
+    """
+    Key of the response for ``request``'s normalized query params, or
+    ``None`` when a param outside the view's ``response_cache_params`` is
+    present and the response must not be shared.
+    """
+    params = request.query_params
+    if any(name not in view.response_cache_params for name in params):
+        return None
+    normalized = sorted(
+        (name, ' '.join(params.get(name).lower().split()))
+        for name in params if params.get(name).strip()
+    )
+    digest = hashlib.md5(repr(normalized).encode()).hexdigest()
+    return versioned_key(view.response_cache_namespace, digest, using='shared')
+
+
+def _cached_response(request, entry):
+    etag = entry['headers'].get('ETag')
+    last_modified = parse_http_date_safe(entry['headers'].get('Last-Modified', ''))
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(entry['content'], content_type='application/json')
+    for header, value in entry['headers'].items():
+        response.headers[header] = value
+    return response
+
+
+def cache_response(view_method):
+    """
+    Cache a viewset action's rendered JSON in the two cache tiers under the
+    view's ``response_cache_namespace``, for ``response_cache_timeout``
+    seconds. Hits are answered from the stored bytes without touching the
+    database or a serializer; bumping the namespace version drops them all.
+    Concurrent misses of one key render it once, see ``get_or_compute``.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = None
+        if request.accepted_renderer.format == 'json':
+            key = response_cache_key(self, request)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+
+        def render():
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                raise _Uncached(response)
+            return {
+                'content': JSONRenderer().render(response.data) if isinstance(response, Response) else response.content,
+                'headers': {header: response.headers[header] for header in CACHED_HEADERS if header in response.headers},
+            }
+
+        try:
+            entry = get_or_compute(key, render, self.response_cache_timeout, tiered=True)
+        except _Uncached as uncached:
+            return uncached.response
+        return _cached_response(request, entry)
+
+    return wrapper
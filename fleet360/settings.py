@@ -46,6 +46,8 @@ INSTALLED_APPS = [
     'drivers',
     'users',
     'bookings',
+    'reports',
+    'search',
 ]
 
 MIDDLEWARE = [
@@ -167,3 +169,56 @@ CORS_ALLOW_CREDENTIALS = True
 JWT_SECRET_KEY = config('JWT_SECRET_KEY', default='your-jwt-secret-key-here')
 JWT_ALGORITHM = config('JWT_ALGORITHM', default='HS256')
 JWT_ACCESS_TOKEN_LIFETIME = config('JWT_ACCESS_TOKEN_LIFETIME', default=604800, cast=int)
+# Seconds an authenticated user stays cached between requests
+JWT_USER_CACHE_TIMEOUT = config('JWT_USER_CACHE_TIMEOUT', default=60, cast=int)
+# Build request.user from the token's claims without any lookup. Tokens then
+# stay valid until they expire, even after a password change.
+JWT_STATELESS_AUTH = config('JWT_STATELESS_AUTH', default=False, cast=bool)
+
+# Number of days ahead covered by the per-vehicle occupancy bitmaps
+OCCUPANCY_HORIZON_DAYS = config('OCCUPANCY_HORIZON_DAYS', default=365, cast=int)
+
+# Cache shared by the API processes. Version counters used for invalidation
+# live here too, so multi-process deployments need a shared backend.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='fleet360'),
+    },
+    # Two-tier response cache, see fleet360.caching.tiered_get: a per-process
+    # tier in front of one every process on the host can read.
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fleet360-local',
+    },
+    'shared': {
+        'BACKEND': config('SHARED_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('SHARED_CACHE_LOCATION', default='/var/tmp/fleet360_cache'),
+    },
+}
+
+# Seconds an entry copied from the shared tier stays in the per-process tier
+LOCAL_CACHE_TIMEOUT = config('LOCAL_CACHE_TIMEOUT', default=30, cast=int)
+
+# Seconds a worker keeps its categories/sub-categories/locations snapshot
+# before reloading it, even when no write was signalled
+REFERENCE_DATA_MAX_AGE = config('REFERENCE_DATA_MAX_AGE', default=300, cast=int)
+
+# Single-flight caching, see fleet360.caching.get_or_compute: seconds an
+# expired entry is still served while one request recomputes it, and the
+# longest a computation holds its lock before others give up waiting
+CACHE_STALE_TIMEOUT = config('CACHE_STALE_TIMEOUT', default=60, cast=int)
+CACHE_LOCK_TIMEOUT = config('CACHE_LOCK_TIMEOUT', default=30, cast=int)
+
+# Seconds a computed booking timeline stays cached
+TIMELINE_CACHE_TIMEOUT = config('TIMELINE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds a list total served for ?count=estimate stays cached
+PAGINATION_COUNT_CACHE_TIMEOUT = config('PAGINATION_COUNT_CACHE_TIMEOUT', default=60, cast=int)
+
+# Seconds a rendered vehicle list page stays cached
+VEHICLE_LIST_CACHE_TIMEOUT = config('VEHICLE_LIST_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds a serialized list row stays cached; rows are keyed by their
+# updated_at, so this only bounds how long unused fragments are kept
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=86400, cast=int)
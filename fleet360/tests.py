@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from fleet360.caching import get_or_compute
+
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'fleet360-tests-{alias}'}
+    for alias in ('default', 'local', 'shared')
+}
+
+
+@override_settings(CACHES=TEST_CACHES, CACHE_STALE_TIMEOUT=60, CACHE_LOCK_TIMEOUT=5, LOCAL_CACHE_TIMEOUT=30)
+class GetOrComputeTests(SimpleTestCase):
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+
+    def slow_counter(self, delay=0.2):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(delay)
+            return len(calls)
+        return compute, calls
+
+    def test_concurrent_misses_compute_once(self):
+        for tiered in (False, True):
+            compute, calls = self.slow_counter()
+            barrier = threading.Barrier(8)
+
+            def read():
+                barrier.wait()
+                return get_or_compute(f'coalesce-{tiered}', compute, 60, tiered=tiered)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: read(), range(8)))
+
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(results, [1] * 8)
+
+    def test_stale_value_is_served_while_one_caller_refreshes(self):
+        compute, calls = self.slow_counter(delay=0.3)
+        get_or_compute('stale', compute, 0)
+        self.assertEqual(len(calls), 1)
+
+        barrier = threading.Barrier(6)
+
+        def read():
+            barrier.wait()
+            return get_or_compute('stale', compute, 60)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda _: read(), range(6)))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(sorted(results), [1] * 5 + [2])
+        self.assertEqual(get_or_compute('stale', compute, 60), 2)
+
+    def test_nested_calls_do_not_block_each_other(self):
+        results = []
+
+        def outer():
+            return get_or_compute('pagination-count:17', lambda: 17, 60) + 1
+
+        def run():
+            results.append(get_or_compute('vehicle-list:1:abc', outer, 60, tiered=True))
+            results.append(get_or_compute('nested-self', lambda: get_or_compute('nested-self', lambda: 3, 60), 60))
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [18, 3])
+
+    def test_failed_computation_is_not_cached(self):
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            get_or_compute('failing', fail, 60)
+        self.assertEqual(get_or_compute('failing', lambda: 'ok', 60), 'ok')
@@ -0,0 +1,64 @@
+from django.db.models import Q
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .normalization import normalize_name, normalize_nic, normalize_phone
+
+TYPEAHEAD_DEFAULT_LIMIT = 10
+TYPEAHEAD_MAX_LIMIT = 25
+
+
+def apply_search_keys(instance):
+    """Set the normalized ``*_key`` columns of a person model from its raw fields."""
+    instance.phone_key = normalize_phone(instance.contact_number)
+    instance.nic_key = normalize_nic(instance.nic)
+    instance.name_key = normalize_name(instance.first_name, instance.last_name)
+    instance.last_name_key = normalize_name(instance.last_name)
+
+
+def typeahead_filter(query):
+    """
+    Prefix conditions on the key columns matching ``query``, or None when it
+    has nothing to match on. Digits-only input is read as a phone number or
+    NIC, anything else as a name or NIC. Each condition is a range scan on
+    its column's index.
+    """
+    phone = normalize_phone(query)
+    nic = normalize_nic(query)
+    name = normalize_name(query)
+    if phone and phone == nic:
+        return Q(phone_key__startswith=phone) | Q(nic_key__startswith=nic)
+    if name:
+        condition = Q(name_key__startswith=name) | Q(last_name_key__startswith=name)
+        if nic:
+            condition |= Q(nic_key__startswith=nic)
+        return condition
+    return None
+
+
+class TypeaheadMixin:
+    """
+    Adds ``GET <list>/typeahead/?q=&limit=`` returning the top matches of
+    ``typeahead_fields`` by the normalized search keys.
+    """
+    typeahead_fields = []
+    
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        condition = typeahead_filter(request.query_params.get('q', ''))
+        try:
+            limit = min(int(request.query_params.get('limit', TYPEAHEAD_DEFAULT_LIMIT)), TYPEAHEAD_MAX_LIMIT)
+        except ValueError:
+            limit = TYPEAHEAD_DEFAULT_LIMIT
+        
+        matches = []
+        if condition is not None and limit > 0:
+            queryset = self.queryset.model.objects.filter(condition).order_by('name_key', 'pk')
+            matches = list(queryset.values(*self.typeahead_fields)[:limit])
+        
+        return Response({
+            'data': matches,
+            'message': 'Matches retrieved successfully',
+            'status': 'success',
+            'code': 200
+        })
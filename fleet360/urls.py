@@ -26,6 +26,8 @@ urlpatterns = [
     path('api/', include('drivers.urls')),
     path('api/', include('users.urls')),
     path('api/', include('bookings.urls')),
+    path('api/', include('reports.urls')),
+    path('api/', include('search.urls')),
 ]
 
 if settings.DEBUG:
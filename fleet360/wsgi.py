@@ -15,3 +15,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fleet360.settings')
 
 application = get_wsgi_application()
 
+# Load categories, sub-categories and locations before the first request
+from fleet360.reference_data import warm_reference_data  # noqa: E402
+
+warm_reference_data()
+
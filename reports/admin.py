@@ -0,0 +1,23 @@
+from django.contrib import admin
+from .models import RevenueDaily, RevenueEntry, VehicleUtilizationDay
+
+
+@admin.register(VehicleUtilizationDay)
+class VehicleUtilizationDayAdmin(admin.ModelAdmin):
+    list_display = ['vehicle', 'day', 'location_id', 'is_booked', 'booking_id']
+    list_filter = ['is_booked', 'day']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(RevenueEntry)
+class RevenueEntryAdmin(admin.ModelAdmin):
+    list_display = ['booking_id', 'entry_type', 'day', 'vehicle_id', 'location_id', 'amount', 'created_at']
+    list_filter = ['entry_type', 'day']
+    search_fields = ['booking_id']
+    readonly_fields = ['created_at']
+
+
+@admin.register(RevenueDaily)
+class RevenueDailyAdmin(admin.ModelAdmin):
+    list_display = ['day', 'vehicle_id', 'location_id', 'booking_amount', 'add_on_amount', 'extension_amount']
+    list_filter = ['day']
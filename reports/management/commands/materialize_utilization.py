@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from reports.utilization import recompute_utilization
+
+
+class Command(BaseCommand):
+    help = 'Write the daily utilization rollup, including idle days, for a range of days (default: today)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='first', help='First day to materialize (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='last', help='Last day to materialize (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        try:
+            first = parse_date(options['first']) if options['first'] else today
+            last = parse_date(options['last']) if options['last'] else today
+        except ValueError:
+            first = last = None
+        if first is None or last is None:
+            raise CommandError('Dates must be given as YYYY-MM-DD')
+
+        written = recompute_utilization(first, last)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} utilization rows from {first} to {min(last, today)}'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from bookings.models import Booking
+from reports.models import RevenueEntry
+from reports.revenue import sync_booking_revenue
+
+
+class Command(BaseCommand):
+    help = 'Reconcile the revenue ledger with every booking, writing correcting entries where they differ'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Bookings reconciled per transaction')
+
+    def handle(self, *args, **options):
+        booking_ids = set(Booking.objects.values_list('pk', flat=True))
+        # Bookings deleted without their entries being reversed
+        booking_ids.update(RevenueEntry.objects.values_list('booking_id', flat=True).distinct())
+        booking_ids = sorted(booking_ids)
+
+        written = 0
+        batch_size = options['batch_size']
+        for offset in range(0, len(booking_ids), batch_size):
+            written += sync_booking_revenue(booking_ids[offset:offset + batch_size])
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {len(booking_ids)} bookings with {written} ledger entries'
+        ))
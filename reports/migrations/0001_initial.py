@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleUtilizationDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category_id', models.IntegerField()),
+                ('sub_category_id', models.IntegerField()),
+                ('location_id', models.IntegerField(blank=True, null=True)),
+                ('is_booked', models.BooleanField(default=False)),
+                ('booking_id', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization_days', to='vehicles.vehicle')),
+            ],
+            options={
+                'db_table': 'vehicle_utilization_days',
+                'indexes': [models.Index(fields=['day', 'category_id'], name='utilization_day_category_idx'), models.Index(fields=['day', 'sub_category_id'], name='utilization_day_sub_cat_idx'), models.Index(fields=['day', 'location_id'], name='utilization_day_location_idx')],
+                'constraints': [models.UniqueConstraint(fields=('vehicle', 'day'), name='unique_vehicle_utilization_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.IntegerField(db_index=True)),
+                ('vehicle_id', models.IntegerField()),
+                ('location_id', models.IntegerField()),
+                ('day', models.DateField()),
+                ('entry_type', models.CharField(choices=[('booking', 'Booking'), ('add_on', 'Add-on'), ('extension', 'Extension'), ('late_fee', 'Late Fee'), ('return', 'Return'), ('refunded_deposit', 'Refunded Deposit')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'revenue_entries',
+            },
+        ),
+        migrations.CreateModel(
+            name='RevenueDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('vehicle_id', models.IntegerField()),
+                ('location_id', models.IntegerField()),
+                ('booking_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('add_on_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('extension_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('late_fee_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('return_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refunded_deposit_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'db_table': 'revenue_daily',
+                'indexes': [models.Index(fields=['vehicle_id', 'day'], name='revenue_daily_vehicle_idx'), models.Index(fields=['location_id', 'day'], name='revenue_daily_location_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'vehicle_id', 'location_id'), name='unique_revenue_daily')],
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+from django.db import models
+from vehicles.models import Vehicle
+
+
+class VehicleUtilizationDay(models.Model):
+    """One row per vehicle and calendar day it was in the fleet, maintained by reports.utilization."""
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='utilization_days')
+    day = models.DateField()
+    # Copied from the vehicle so rollups group without joins
+    category_id = models.IntegerField()
+    sub_category_id = models.IntegerField()
+    # Pickup location while booked, last drop-off location while idle
+    location_id = models.IntegerField(null=True, blank=True)
+    is_booked = models.BooleanField(default=False)
+    booking_id = models.IntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.vehicle_id} - {self.day}"
+    
+    class Meta:
+        db_table = 'vehicle_utilization_days'
+        constraints = [
+            models.UniqueConstraint(fields=['vehicle', 'day'], name='unique_vehicle_utilization_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'category_id'], name='utilization_day_category_idx'),
+            models.Index(fields=['day', 'sub_category_id'], name='utilization_day_sub_cat_idx'),
+            models.Index(fields=['day', 'location_id'], name='utilization_day_location_idx'),
+        ]
+
+
+class RevenueEntry(models.Model):
+    """
+    Append-only revenue ledger. Rows are never updated or deleted; changes
+    to a booking are recorded as correcting entries, so the sum of a
+    booking's entries always matches its current amounts.
+    """
+    ENTRY_TYPE_CHOICES = [
+        ('booking', 'Booking'),
+        ('add_on', 'Add-on'),
+        ('extension', 'Extension'),
+        ('late_fee', 'Late Fee'),
+        ('return', 'Return'),
+        ('refunded_deposit', 'Refunded Deposit'),
+    ]
+    
+    # Plain ids so the ledger outlives deleted bookings and vehicles
+    booking_id = models.IntegerField(db_index=True)
+    vehicle_id = models.IntegerField()
+    location_id = models.IntegerField()
+    day = models.DateField()
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPE_CHOICES)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.entry_type} {self.amount} for Booking {self.booking_id}"
+    
+    class Meta:
+        db_table = 'revenue_entries'
+
+
+class RevenueDaily(models.Model):
+    """Ledger totals per day, vehicle and location, kept in step with every ledger insert."""
+    day = models.DateField()
+    vehicle_id = models.IntegerField()
+    location_id = models.IntegerField()
+    booking_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    add_on_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    extension_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    late_fee_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    return_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    refunded_deposit_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    def __str__(self):
+        return f"{self.day} - {self.vehicle_id} - {self.location_id}"
+    
+    class Meta:
+        db_table = 'revenue_daily'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'vehicle_id', 'location_id'], name='unique_revenue_daily'),
+        ]
+        indexes = [
+            models.Index(fields=['vehicle_id', 'day'], name='revenue_daily_vehicle_idx'),
+            models.Index(fields=['location_id', 'day'], name='revenue_daily_location_idx'),
+        ]
@@ -0,0 +1,168 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from bookings.models import Booking, BookingAddOn, BookingExtension, BookingReturn
+from .models import RevenueDaily, RevenueEntry
+from .utilization import group_names
+
+# Ledger entry type -> RevenueDaily column holding its total
+DAILY_FIELDS = {
+    'booking': 'booking_amount',
+    'add_on': 'add_on_amount',
+    'extension': 'extension_amount',
+    'late_fee': 'late_fee_amount',
+    'return': 'return_amount',
+    'refunded_deposit': 'refunded_deposit_amount',
+}
+
+# Dimensions the revenue report can be grouped by, mapped to their RevenueDaily column
+GROUP_BY_FIELDS = {
+    'day': 'day',
+    'vehicle': 'vehicle_id',
+    'location': 'location_id',
+}
+
+
+def _booking_targets(booking_ids, posted, today):
+    """
+    Amounts the ledger should hold for ``booking_ids``, keyed by
+    ``(booking_id, entry_type, day, vehicle_id, location_id)``, given the
+    ``posted`` totals under the same keys.
+
+    Rental charges are booked on the pickup day at the pickup location,
+    extensions on the day they were agreed, and return charges and refunds
+    on the return day at the drop-off location. Late fees grow every night
+    while a booking is overdue, so like extensions each change is booked on
+    the day it happens, ``today``, at the drop-off location, and days
+    already posted are left alone. A cancelled booking keeps only what was
+    settled on return.
+    """
+    targets = defaultdict(Decimal)
+    bookings = {
+        booking['booking_id']: booking
+        for booking in Booking.objects.filter(pk__in=booking_ids).values(
+            'booking_id', 'vehicle_id', 'pickup_location_id', 'dropoff_location_id',
+            'booking_date', 'return_date', 'status', 'total_amount', 'late_fee_amount'
+        )
+    }
+
+    def add(booking, entry_type, day, location_id, amount):
+        if amount:
+            targets[(booking['booking_id'], entry_type, day, booking['vehicle_id'], location_id)] += amount
+
+    add_on_totals = dict(
+        BookingAddOn.objects.filter(booking_id__in=bookings).values('booking_id')
+        .annotate(total=Sum('add_on_price')).values_list('booking_id', 'total')
+    )
+    for booking in bookings.values():
+        if booking['status'] == 'cancelled':
+            continue
+        pickup_day = timezone.localdate(booking['booking_date'])
+        add(booking, 'booking', pickup_day, booking['pickup_location_id'], booking['total_amount'])
+        add(booking, 'add_on', pickup_day, booking['pickup_location_id'], add_on_totals.get(booking['booking_id']))
+
+    for booking_id, created_at, price in BookingExtension.objects.filter(booking_id__in=bookings).values_list(
+        'booking_id', 'created_at', 'price'
+    ):
+        booking = bookings[booking_id]
+        if booking['status'] != 'cancelled':
+            add(booking, 'extension', timezone.localdate(created_at), booking['pickup_location_id'], price)
+
+    for booking_id, return_date, total_amount, refunded_deposit_amount in BookingReturn.objects.filter(
+        booking_id__in=bookings
+    ).values_list('booking_id', 'return_date', 'total_amount', 'refunded_deposit_amount'):
+        booking = bookings[booking_id]
+        add(booking, 'return', return_date, booking['dropoff_location_id'], total_amount)
+        add(booking, 'refunded_deposit', return_date, booking['dropoff_location_id'], refunded_deposit_amount)
+
+    late_fees_posted = defaultdict(Decimal)
+    for key, amount in posted.items():
+        if key[1] == 'late_fee' and key[0] in bookings:
+            targets[key] += amount
+            late_fees_posted[key[0]] += amount
+    for booking in bookings.values():
+        late_fee_amount = booking['late_fee_amount'] if booking['status'] != 'cancelled' else Decimal('0')
+        add(booking, 'late_fee', today, booking['dropoff_location_id'],
+            late_fee_amount - late_fees_posted[booking['booking_id']])
+
+    return targets
+
+
+def _apply_to_daily(entries):
+    """Add new ledger entries to the daily totals, one UPDATE per touched row."""
+    deltas = defaultdict(lambda: defaultdict(Decimal))
+    for entry in entries:
+        deltas[(entry.day, entry.vehicle_id, entry.location_id)][DAILY_FIELDS[entry.entry_type]] += entry.amount
+
+    for (day, vehicle_id, location_id), amounts in deltas.items():
+        row = RevenueDaily.objects.filter(day=day, vehicle_id=vehicle_id, location_id=location_id)
+        increments = {field: F(field) + amount for field, amount in amounts.items()}
+        if row.update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                RevenueDaily.objects.create(day=day, vehicle_id=vehicle_id, location_id=location_id, **amounts)
+        except IntegrityError:
+            # Created by a concurrent sync in the meantime
+            row.update(**increments)
+
+
+def sync_booking_revenue(booking_ids, today=None):
+    """
+    Append the ledger entries that bring ``booking_ids`` in line with their
+    current amounts and fold them into the daily totals. Idempotent: a
+    booking whose ledger already matches gets no new entries. Deleted
+    bookings are fully reversed. Late fee changes are posted on ``today``.
+    Returns the number of entries written.
+    """
+    today = today or timezone.localdate()
+    booking_ids = list(booking_ids)
+    with transaction.atomic():
+        # Serialise syncs of the same booking so a correction is never posted twice
+        list(Booking.objects.select_for_update().filter(pk__in=booking_ids).values_list('pk', flat=True))
+        posted = RevenueEntry.objects.filter(booking_id__in=booking_ids).values(
+            'booking_id', 'entry_type', 'day', 'vehicle_id', 'location_id'
+        ).annotate(total=Sum('amount')).values_list(
+            'booking_id', 'entry_type', 'day', 'vehicle_id', 'location_id', 'total'
+        )
+        current = {row[:5]: row[5] for row in posted}
+        targets = _booking_targets(booking_ids, current, today)
+
+        entries = []
+        for key in targets.keys() | current.keys():
+            delta = targets.get(key, Decimal('0')) - current.get(key, Decimal('0'))
+            if delta:
+                booking_id, entry_type, day, vehicle_id, location_id = key
+                entries.append(RevenueEntry(
+                    booking_id=booking_id, entry_type=entry_type, day=day,
+                    vehicle_id=vehicle_id, location_id=location_id, amount=delta,
+                ))
+
+        RevenueEntry.objects.bulk_create(entries, batch_size=1000)
+        _apply_to_daily(entries)
+    return len(entries)
+
+
+def revenue_report(first, last, group_by='day'):
+    """Per-type revenue totals for [first, last] with one aggregate query over the daily totals."""
+    field = GROUP_BY_FIELDS[group_by]
+    totals = list(
+        RevenueDaily.objects.filter(day__range=(first, last)).values(field)
+        .annotate(**{column: Sum(column) for column in DAILY_FIELDS.values()})
+        .order_by(field)
+    )
+
+    names = {}
+    if group_by != 'day':
+        names = group_names(group_by, [row[field] for row in totals])
+    report = []
+    for row in totals:
+        key = row.pop(field)
+        item = {'day': key} if group_by == 'day' else {f'{group_by}_id': key, 'name': names.get(key)}
+        item.update(row)
+        report.append(item)
+    return report
@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from bookings.models import Booking, BookingAddOn, BookingExtension, BookingReturn
+from bookings.sweeper import late_fees_accrued
+from vehicles.models import Vehicle
+from .models import VehicleUtilizationDay
+from .revenue import sync_booking_revenue
+from .utilization import recompute_booking_period, recompute_utilization
+
+# Booking fields that change which days, or where, a vehicle was used
+ROLLUP_FIELDS = ('vehicle_id', 'booking_date', 'return_date', 'pickup_location_id', 'dropoff_location_id')
+
+
+def _recompute_on_commit(periods):
+    transaction.on_commit(lambda: [recompute_booking_period(*period) for period in periods])
+
+
+def _changes_rollup(previous, booking):
+    if (previous['status'] == 'cancelled') != (booking.status == 'cancelled'):
+        return True
+    return any(previous[field] != getattr(booking, field) for field in ROLLUP_FIELDS)
+
+
+@receiver(post_save, sender=Booking)
+def update_utilization_on_booking_save(sender, instance, created, **kwargs):
+    # bookings.signals stores the pre-save row on the instance
+    previous = getattr(instance, '_previous_state', None)
+    if not created and previous is not None and not _changes_rollup(previous, instance):
+        return
+    periods = [(instance.vehicle_id, instance.booking_date, instance.return_date)]
+    if previous is not None:
+        periods.append((previous['vehicle_id'], previous['booking_date'], previous['return_date']))
+    _recompute_on_commit(periods)
+
+
+@receiver(post_delete, sender=Booking)
+def update_utilization_on_booking_delete(sender, instance, **kwargs):
+    _recompute_on_commit([(instance.vehicle_id, instance.booking_date, instance.return_date)])
+
+
+@receiver(post_save, sender=BookingExtension)
+@receiver(post_save, sender=BookingReturn)
+def update_utilization_on_booking_change(sender, instance, **kwargs):
+    booking = instance.booking
+    _recompute_on_commit([(booking.vehicle_id, booking.booking_date, booking.return_date)])
+
+
+@receiver(post_save, sender=Vehicle)
+def update_utilization_on_vehicle_save(sender, instance, created, **kwargs):
+    if created:
+        today = timezone.localdate(instance.created_at)
+        transaction.on_commit(lambda: recompute_utilization(today, today, vehicle_ids=[instance.pk]))
+    else:
+        VehicleUtilizationDay.objects.filter(vehicle=instance).update(
+            category_id=instance.category_id,
+            sub_category_id=instance.sub_category_id,
+        )
+
+
+def _sync_revenue_on_commit(booking_id):
+    transaction.on_commit(lambda: sync_booking_revenue([booking_id]))
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def update_revenue_on_booking_change(sender, instance, **kwargs):
+    _sync_revenue_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=BookingAddOn)
+@receiver(post_delete, sender=BookingAddOn)
+@receiver(post_save, sender=BookingExtension)
+@receiver(post_delete, sender=BookingExtension)
+@receiver(post_save, sender=BookingReturn)
+@receiver(post_delete, sender=BookingReturn)
+def update_revenue_on_charge_change(sender, instance, **kwargs):
+    _sync_revenue_on_commit(instance.booking_id)
+
+
+@receiver(late_fees_accrued)
+def update_revenue_on_late_fees(sender, day, **kwargs):
+    overdue = Booking.objects.filter(status='overdue', late_fee_accrued_until=day)
+    sync_booking_revenue(overdue.values_list('pk', flat=True), today=day)
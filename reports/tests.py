@@ -0,0 +1,170 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from bookings.models import Booking, BookingAddOn, Location
+from bookings.sweeper import accrue_late_fees
+from customers.models import Customer
+from vehicles.models import Vehicle, VehicleCategory, VehicleSubCategory
+from .models import RevenueDaily, RevenueEntry, VehicleUtilizationDay
+from .revenue import revenue_report, sync_booking_revenue
+from .utilization import recompute_utilization, utilization_report
+
+
+class ReportTestCase(TestCase):
+    """A vehicle in the fleet since ``first_day``, two locations and a customer to book it for."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.first_day = self.today - timedelta(days=9)
+        self.kandy = Location.objects.create(name='Kandy', address='Kandy')
+        self.colombo = Location.objects.create(name='Colombo', address='Colombo')
+        self.customer = Customer.objects.create(
+            first_name='John', last_name='Doe', user_name='johndoe', email='john.doe@example.com',
+            contact_number='+94771234567', address='Colombo', nic='123456789V',
+            nationality='Sri Lankan', country='Sri Lanka'
+        )
+        self.category = VehicleCategory.objects.create(category_name='Car')
+        sub_category = VehicleSubCategory.objects.create(category=self.category, sub_category_name='Sedan')
+        self.vehicle = Vehicle.objects.create(
+            category=self.category, sub_category=sub_category, vehicle_name='Axio', engine_capacity=1500,
+            fuel_type='petrol', color='White', make='Toyota', model='Axio', transmission='auto',
+            price_per_day=Decimal('50.00'), no_of_seats=4, insurance_no='INS-1',
+            insurance_expiry=date(2030, 1, 1), registration_no='CAB-1234', vin='VIN-1',
+            base_km_per_day=100, excess_km_charge=Decimal('1.50'), registration_expiry=date(2030, 1, 1),
+            deposit_amount=Decimal('100.00'), late_fee=Decimal('20.00')
+        )
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(
+            created_at=timezone.make_aware(datetime.combine(self.first_day, time(8)))
+        )
+
+    def at(self, day, hour=10):
+        return timezone.make_aware(datetime.combine(day, time(hour)))
+
+    def book(self, first, last, **kwargs):
+        fields = dict(
+            booking_date=self.at(first), return_date=self.at(last), pickup_location=self.kandy,
+            dropoff_location=self.colombo, starting_odometer_reading=1000, customer=self.customer,
+            vehicle=self.vehicle, driving_type='self_drive', no_of_passengers=2,
+            fuel_responsibility='by_client', deposited_amount=Decimal('100.00'), insurance_type='general',
+            total_amount=Decimal('150.00'), status='confirmed',
+        )
+        fields.update(kwargs)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(**fields)
+
+    def save(self, booking):
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+
+
+class UtilizationRollupTests(ReportTestCase):
+
+    def test_rollup_marks_booked_days_and_where_the_vehicle_was(self):
+        self.book(self.today - timedelta(days=6), self.today - timedelta(days=4))
+        recompute_utilization(self.first_day, self.today)
+
+        days = {
+            row.day: row for row in VehicleUtilizationDay.objects.filter(vehicle=self.vehicle)
+        }
+        self.assertEqual(sorted(days), [self.first_day + timedelta(days=offset) for offset in range(10)])
+        self.assertEqual(
+            [day for day, row in sorted(days.items()) if row.is_booked],
+            [self.today - timedelta(days=offset) for offset in (6, 5, 4)],
+        )
+        self.assertIsNone(days[self.first_day].location_id)
+        self.assertEqual(days[self.today - timedelta(days=5)].location_id, self.kandy.pk)
+        # Idle after the return, at the drop-off location
+        self.assertEqual(days[self.today - timedelta(days=3)].location_id, self.colombo.pk)
+
+    def test_report_divides_booked_by_available_days(self):
+        self.book(self.today - timedelta(days=6), self.today - timedelta(days=4))
+        recompute_utilization(self.first_day, self.today)
+
+        report = utilization_report(self.first_day, self.today, group_by='category')
+
+        self.assertEqual(report, [{
+            'category_id': self.category.pk, 'name': 'Car', 'available_days': 10, 'booked_days': 3,
+            'utilization': 0.3,
+        }])
+
+    def test_booking_changes_refresh_the_rollup(self):
+        recompute_utilization(self.first_day, self.today)
+        booking = self.book(self.today - timedelta(days=3), self.today - timedelta(days=2))
+        self.assertEqual(VehicleUtilizationDay.objects.filter(is_booked=True).count(), 2)
+
+        booking.status = 'cancelled'
+        self.save(booking)
+
+        self.assertFalse(VehicleUtilizationDay.objects.filter(is_booked=True).exists())
+        self.assertEqual(VehicleUtilizationDay.objects.count(), 10)
+
+
+class RevenueLedgerTests(ReportTestCase):
+
+    def entries(self, entry_type):
+        return sorted(
+            RevenueEntry.objects.filter(entry_type=entry_type).values_list('day', 'location_id', 'amount')
+        )
+
+    def daily(self, day, field):
+        return RevenueDaily.objects.filter(day=day).values_list(field, flat=True).first()
+
+    def test_booking_charges_are_posted_on_the_pickup_day(self):
+        pickup_day = self.today - timedelta(days=6)
+        booking = self.book(pickup_day, self.today - timedelta(days=4))
+        with self.captureOnCommitCallbacks(execute=True):
+            BookingAddOn.objects.create(booking=booking, add_on_name='Child seat', add_on_price=Decimal('10.00'))
+
+        self.assertEqual(self.entries('booking'), [(pickup_day, self.kandy.pk, Decimal('150.00'))])
+        self.assertEqual(self.entries('add_on'), [(pickup_day, self.kandy.pk, Decimal('10.00'))])
+        self.assertEqual(revenue_report(pickup_day, pickup_day)[0]['booking_amount'], Decimal('150.00'))
+
+    def test_changes_are_appended_as_correcting_entries(self):
+        pickup_day = self.today - timedelta(days=6)
+        booking = self.book(pickup_day, self.today - timedelta(days=4))
+
+        booking.total_amount = Decimal('200.00')
+        self.save(booking)
+        self.assertEqual(self.entries('booking'), [
+            (pickup_day, self.kandy.pk, Decimal('50.00')),
+            (pickup_day, self.kandy.pk, Decimal('150.00')),
+        ])
+        self.assertEqual(self.daily(pickup_day, 'booking_amount'), Decimal('200.00'))
+
+        booking.status = 'cancelled'
+        self.save(booking)
+        self.assertEqual(self.entries('booking')[0], (pickup_day, self.kandy.pk, Decimal('-200.00')))
+        self.assertEqual(self.daily(pickup_day, 'booking_amount'), Decimal('0.00'))
+
+        # Already in line, nothing more to post
+        self.assertEqual(sync_booking_revenue([booking.pk]), 0)
+
+    def test_deleted_booking_is_reversed(self):
+        pickup_day = self.today - timedelta(days=6)
+        booking = self.book(pickup_day, self.today - timedelta(days=4))
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+
+        self.assertEqual(RevenueEntry.objects.filter(entry_type='booking').count(), 2)
+        self.assertEqual(self.daily(pickup_day, 'booking_amount'), Decimal('0.00'))
+
+    def test_late_fees_are_posted_on_the_day_they_accrue(self):
+        return_day = self.today - timedelta(days=3)
+        booking = self.book(self.today - timedelta(days=6), return_day)
+        Booking.objects.filter(pk=booking.pk).update(status='overdue', late_fee_accrued_until=return_day)
+
+        first_night, second_night = return_day + timedelta(days=1), return_day + timedelta(days=2)
+        for night in (first_night, second_night):
+            accrue_late_fees(today=night)
+            sync_booking_revenue([booking.pk], today=night)
+
+        # The first night's total is not rewritten when the second night accrues
+        self.assertEqual(self.entries('late_fee'), [
+            (first_night, self.colombo.pk, Decimal('20.00')),
+            (second_night, self.colombo.pk, Decimal('20.00')),
+        ])
+        self.assertEqual(self.daily(first_night, 'late_fee_amount'), Decimal('20.00'))
+        self.assertEqual(self.daily(second_night, 'late_fee_amount'), Decimal('20.00'))
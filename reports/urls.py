@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import RevenueViewSet, UtilizationViewSet
+
+router = DefaultRouter()
+router.register(r'reports/utilization', UtilizationViewSet, basename='utilization')
+router.register(r'reports/revenue', RevenueViewSet, basename='revenue')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
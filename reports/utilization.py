@@ -0,0 +1,160 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from bookings.availability import touched_days
+from bookings.models import Booking, Location
+from vehicles.models import Vehicle, VehicleCategory, VehicleSubCategory
+from .models import VehicleUtilizationDay
+
+# Dimensions the rollup can be grouped by, mapped to their rollup column
+GROUP_BY_FIELDS = {
+    'vehicle': 'vehicle_id',
+    'sub_category': 'sub_category_id',
+    'category': 'category_id',
+    'location': 'location_id',
+}
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _used_days(booking):
+    first, last = touched_days(booking['booking_date'], booking['return_date'])
+    # A returned booking stops using the vehicle on the actual return day
+    if booking['return_details__return_date'] is not None:
+        last = max(first, booking['return_details__return_date'])
+    return first, last
+
+
+def _vehicle_days(vehicle, bookings, first, last):
+    """Build the rollup rows of one vehicle for [first, last] from its bookings in pickup order."""
+    in_fleet_from = timezone.localdate(vehicle['created_at'])
+    location_id = vehicle['last_dropoff_location_id']
+    periods = [(*_used_days(booking), booking) for booking in bookings]
+    index = 0
+    rows = []
+
+    day = first
+    while day <= last:
+        while index < len(periods) and periods[index][1] < day:
+            location_id = periods[index][2]['dropoff_location_id']
+            index += 1
+        booking = periods[index][2] if index < len(periods) and periods[index][0] <= day else None
+        if booking is not None or day >= in_fleet_from:
+            rows.append(VehicleUtilizationDay(
+                vehicle_id=vehicle['vehicle_id'],
+                day=day,
+                category_id=vehicle['category_id'],
+                sub_category_id=vehicle['sub_category_id'],
+                location_id=booking['pickup_location_id'] if booking else location_id,
+                is_booked=booking is not None,
+                booking_id=booking['booking_id'] if booking else None,
+            ))
+        day += timedelta(days=1)
+    return rows
+
+
+def recompute_utilization(first, last, vehicle_ids=None):
+    """
+    Rewrite the rollup rows of ``vehicle_ids`` (all vehicles when None) for
+    the days [first, last]. Days after today are left alone; they are
+    written once they have happened. Returns the number of rows written.
+    """
+    last = min(last, timezone.localdate())
+    if first > last:
+        return 0
+
+    window_start, window_end = _day_start(first), _day_start(last + timedelta(days=1))
+    settled = Booking.objects.exclude(status='cancelled')
+
+    vehicles = Vehicle.objects.annotate(
+        last_dropoff_location_id=Subquery(
+            settled.filter(vehicle_id=OuterRef('pk'), return_date__lte=window_start)
+            .order_by('-return_date').values('dropoff_location_id')[:1]
+        )
+    )
+    bookings = settled.filter(booking_date__lt=window_end, return_date__gt=window_start)
+    if vehicle_ids is not None:
+        vehicles = vehicles.filter(pk__in=vehicle_ids)
+        bookings = bookings.filter(vehicle_id__in=vehicle_ids)
+
+    by_vehicle = defaultdict(list)
+    for booking in bookings.order_by('booking_date', 'booking_id').values(
+        'booking_id', 'vehicle_id', 'booking_date', 'return_date',
+        'pickup_location_id', 'dropoff_location_id', 'return_details__return_date'
+    ).iterator():
+        by_vehicle[booking['vehicle_id']].append(booking)
+
+    rows = []
+    for vehicle in vehicles.values(
+        'vehicle_id', 'category_id', 'sub_category_id', 'created_at', 'last_dropoff_location_id'
+    ).iterator():
+        rows.extend(_vehicle_days(vehicle, by_vehicle[vehicle['vehicle_id']], first, last))
+
+    with transaction.atomic():
+        existing = VehicleUtilizationDay.objects.filter(day__range=(first, last))
+        if vehicle_ids is not None:
+            existing = existing.filter(vehicle_id__in=vehicle_ids)
+        existing.delete()
+        VehicleUtilizationDay.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def recompute_booking_period(vehicle_id, start, end):
+    """
+    Recompute the days a booking of ``vehicle_id`` over [start, end) touched
+    or touches. Idle days after it take their location from its drop-off,
+    so they are refreshed too, up to the vehicle's next booking.
+    """
+    if timezone.localdate(start) > timezone.localdate():
+        return 0
+    next_booking_date = Booking.objects.exclude(status='cancelled').filter(
+        vehicle_id=vehicle_id, booking_date__gte=end
+    ).order_by('booking_date').values_list('booking_date', flat=True).first()
+    last = timezone.localdate()
+    if next_booking_date is not None:
+        last = min(last, timezone.localdate(next_booking_date) - timedelta(days=1))
+    first, touched_last = touched_days(start, end)
+    return recompute_utilization(first, max(last, touched_last), vehicle_ids=[vehicle_id])
+
+
+def group_names(group_by, ids):
+    if group_by == 'vehicle':
+        rows = Vehicle.objects.filter(pk__in=ids).values_list('vehicle_id', 'vehicle_name')
+    elif group_by == 'sub_category':
+        rows = VehicleSubCategory.objects.filter(pk__in=ids).values_list('pk', 'sub_category_name')
+    elif group_by == 'category':
+        rows = VehicleCategory.objects.filter(pk__in=ids).values_list('pk', 'category_name')
+    else:
+        rows = Location.objects.filter(pk__in=ids).values_list('location_id', 'name')
+    return dict(rows)
+
+
+def utilization_report(first, last, group_by='category'):
+    """
+    Booked days over available days per ``group_by`` value for [first, last],
+    read with one aggregate query over the rollup.
+    """
+    field = GROUP_BY_FIELDS[group_by]
+    totals = VehicleUtilizationDay.objects.filter(day__range=(first, last)).values(field).annotate(
+        available_days=Count('pk'),
+        booked_days=Count('pk', filter=Q(is_booked=True)),
+    ).order_by(field)
+
+    totals = list(totals)
+    names = group_names(group_by, [row[field] for row in totals if row[field] is not None])
+    return [
+        {
+            f'{group_by}_id': row[field],
+            'name': names.get(row[field]),
+            'available_days': row['available_days'],
+            'booked_days': row['booked_days'],
+            'utilization': round(row['booked_days'] / row['available_days'], 4),
+        }
+        for row in totals
+    ]
@@ -0,0 +1,68 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django.utils.dateparse import parse_date
+from .revenue import GROUP_BY_FIELDS as REVENUE_GROUP_BY_FIELDS, revenue_report
+from .utilization import GROUP_BY_FIELDS as UTILIZATION_GROUP_BY_FIELDS, utilization_report
+
+
+def parse_day_range(request):
+    """Return ``(first, last)`` dates from ``start_date``/``end_date``, or an error message."""
+    try:
+        first = parse_date(request.query_params.get('start_date', ''))
+        last = parse_date(request.query_params.get('end_date', ''))
+    except ValueError:
+        first = last = None
+    if first is None or last is None:
+        return None, 'start_date and end_date are required as YYYY-MM-DD'
+    if last < first:
+        return None, 'end_date must not be before start_date'
+    return (first, last), None
+
+
+class UtilizationViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    
+    def list(self, request):
+        day_range, error = parse_day_range(request)
+        group_by = request.query_params.get('group_by', 'category')
+        
+        if error is None and group_by not in UTILIZATION_GROUP_BY_FIELDS:
+            error = f"group_by must be one of {', '.join(UTILIZATION_GROUP_BY_FIELDS)}"
+        if error:
+            return Response({
+                'message': error,
+                'status': 'error',
+                'code': 400
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'data': utilization_report(*day_range, group_by=group_by),
+            'message': 'Utilization retrieved successfully',
+            'status': 'success',
+            'code': 200
+        })
+
+
+class RevenueViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    
+    def list(self, request):
+        day_range, error = parse_day_range(request)
+        group_by = request.query_params.get('group_by', 'day')
+        
+        if error is None and group_by not in REVENUE_GROUP_BY_FIELDS:
+            error = f"group_by must be one of {', '.join(REVENUE_GROUP_BY_FIELDS)}"
+        if error:
+            return Response({
+                'message': error,
+                'status': 'error',
+                'code': 400
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'data': revenue_report(*day_range, group_by=group_by),
+            'message': 'Revenue retrieved successfully',
+            'status': 'success',
+            'code': 200
+        })
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['entity_type', 'object_id', 'title', 'subtitle', 'updated_at']
+    list_filter = ['entity_type']
+    search_fields = ['title']
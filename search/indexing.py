@@ -0,0 +1,163 @@
+import operator
+from functools import reduce
+
+from django.db import connection, transaction
+from django.db.models import Case, F, Max, Q, Sum, Value, When, Window
+from django.db.models.functions import RowNumber
+
+from bookings.models import Booking
+from customers.models import Customer
+from drivers.models import Driver
+from fleet360.normalization import normalize_nic, normalize_phone, search_tokens
+from vehicles.models import Vehicle
+from vehicles.search import vehicle_tokens
+from .models import SearchDocument, SearchTerm
+
+# Result groups of the search response, by entity type
+RESULT_GROUPS = {
+    'customer': 'customers',
+    'driver': 'drivers',
+    'vehicle': 'vehicles',
+    'booking': 'bookings',
+}
+
+
+def _add_terms(terms, text, weight):
+    for token in search_tokens(text):
+        token = token[:64]
+        terms[token] = max(terms.get(token, 0), weight)
+
+
+def _person_document(person):
+    terms = {}
+    _add_terms(terms, f'{person.first_name} {person.last_name}', 3)
+    _add_terms(terms, person.email.split('@')[0], 2)
+    for key in (normalize_phone(person.contact_number), normalize_nic(person.nic).lower()):
+        if key:
+            terms[key[:64]] = 3
+    title = f'{person.first_name} {person.last_name}'
+    return title, f'{person.contact_number} · {person.nic}', terms
+
+
+def _vehicle_document(vehicle):
+    title = f'{vehicle.make} {vehicle.model} {vehicle.vehicle_name}'
+    return title, vehicle.registration_no, vehicle_tokens(vehicle)
+
+
+def _booking_document(booking):
+    terms = {str(booking.booking_id): 4}
+    _add_terms(terms, f'{booking.customer.first_name} {booking.customer.last_name}', 1)
+    for token, weight in vehicle_tokens(booking.vehicle).items():
+        terms.setdefault(token, 1 if weight < 4 else 2)
+    title = f'Booking {booking.booking_id}'
+    subtitle = (
+        f'{booking.customer.first_name} {booking.customer.last_name} · '
+        f'{booking.vehicle.registration_no} · {booking.status}'
+    )
+    return title, subtitle, terms
+
+
+# Entity type -> (queryset of indexed objects, document builder)
+INDEXERS = {
+    'customer': (lambda: Customer.objects.all(), _person_document),
+    'driver': (lambda: Driver.objects.all(), _person_document),
+    'vehicle': (lambda: Vehicle.objects.all(), _vehicle_document),
+    'booking': (lambda: Booking.objects.select_related('customer', 'vehicle'), _booking_document),
+}
+
+
+def index_objects(entity_type, object_ids):
+    """
+    (Re)index objects of ``entity_type``. Documents are upserted and their
+    terms replaced in a few statements for the whole batch; ids that no
+    longer exist are removed from the index.
+    """
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+    queryset, build = INDEXERS[entity_type]
+    documents = {obj.pk: build(obj) for obj in queryset().filter(pk__in=object_ids)}
+
+    # MySQL upserts on any unique key and does not accept an explicit target
+    unique_fields = ['entity_type', 'object_id'] if connection.features.supports_update_conflicts_with_target else None
+    with transaction.atomic():
+        SearchDocument.objects.filter(entity_type=entity_type, object_id__in=object_ids).exclude(
+            object_id__in=documents
+        ).delete()
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(entity_type=entity_type, object_id=object_id, title=title[:255], subtitle=subtitle[:255])
+                for object_id, (title, subtitle, _) in documents.items()
+            ],
+            update_conflicts=True,
+            update_fields=['title', 'subtitle', 'updated_at'],
+            unique_fields=unique_fields,
+        )
+        document_ids = dict(SearchDocument.objects.filter(
+            entity_type=entity_type, object_id__in=documents
+        ).values_list('object_id', 'pk'))
+        SearchTerm.objects.filter(document_id__in=document_ids.values()).delete()
+        SearchTerm.objects.bulk_create([
+            SearchTerm(term=term, document_id=document_ids[object_id], weight=weight)
+            for object_id, (_, _, terms) in documents.items()
+            for term, weight in terms.items()
+        ], batch_size=1000)
+
+
+def remove_objects(entity_type, object_ids):
+    SearchDocument.objects.filter(entity_type=entity_type, object_id__in=list(object_ids)).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """Index every customer, driver, vehicle and booking. Returns the number of documents."""
+    total = 0
+    for entity_type, (queryset, _) in INDEXERS.items():
+        object_ids = list(queryset().values_list('pk', flat=True))
+        for offset in range(0, len(object_ids), batch_size):
+            index_objects(entity_type, object_ids[offset:offset + batch_size])
+        total += len(object_ids)
+    return total
+
+
+def search(query, limit=5):
+    """
+    Top ``limit`` documents per entity type for ``query``, grouped by type.
+
+    Every query word must be a prefix of some indexed word of a document;
+    each prefix is one range scan on the ``(term, document)`` index and the
+    documents are ranked by the summed weights of the words they matched,
+    with whole-word matches counting double. Documents are ranked and cut
+    within their own type, so a type with many strong matches cannot push
+    the others out of the response.
+    """
+    tokens = [token[:64] for token in search_tokens(query)]
+    results = {group: [] for group in RESULT_GROUPS.values()}
+    if not tokens or limit <= 0:
+        return results
+
+    prefixes = reduce(operator.or_, (Q(term__startswith=token) for token in tokens))
+    matched = reduce(operator.add, (
+        Max(Case(When(term__startswith=token, then=Value(1)), default=Value(0)))
+        for token in tokens
+    ))
+    relevance = Sum(Case(When(term__in=tokens, then=F('weight') * 2), default=F('weight')))
+    hits = SearchTerm.objects.filter(prefixes).values(
+        'document_id', 'document__entity_type', 'document__object_id', 'document__title', 'document__subtitle'
+    ).annotate(
+        matched=matched, score=relevance
+    ).filter(matched=len(tokens)).annotate(
+        rank=Window(
+            RowNumber(),
+            partition_by=F('document__entity_type'),
+            order_by=[F('score').desc(), F('document_id').asc()],
+        )
+    ).filter(rank__lte=limit).order_by('-score', 'document_id')
+
+    for hit in hits:
+        results[RESULT_GROUPS[hit['document__entity_type']]].append({
+            'id': hit['document__object_id'],
+            'title': hit['document__title'],
+            'subtitle': hit['document__subtitle'],
+            'score': hit['score'],
+        })
+    return results
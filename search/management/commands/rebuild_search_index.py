@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from search.indexing import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Index every customer, driver, vehicle and booking for the global search'
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} documents'))
@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """One searchable customer, driver, vehicle or booking. Maintained by ``search.indexing``."""
+    ENTITY_TYPE_CHOICES = [
+        ('customer', 'Customer'),
+        ('driver', 'Driver'),
+        ('vehicle', 'Vehicle'),
+        ('booking', 'Booking'),
+    ]
+    
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPE_CHOICES)
+    object_id = models.IntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.entity_type} {self.object_id} - {self.title}"
+    
+    class Meta:
+        db_table = 'search_documents'
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'object_id'], name='unique_search_document'),
+        ]
+
+
+class SearchTerm(models.Model):
+    """Inverted index entry: a word and the document it appears in."""
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='terms')
+    weight = models.IntegerField(default=1)
+    
+    def __str__(self):
+        return f"{self.term} - {self.document_id}"
+    
+    class Meta:
+        db_table = 'search_terms'
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'document'], name='unique_search_term'),
+        ]
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from bookings.sweeper import bookings_marked_overdue
+from customers.models import Customer
+from drivers.models import Driver
+from vehicles.models import Vehicle
+from .indexing import index_objects, remove_objects
+
+ENTITY_TYPES = {
+    Customer: 'customer',
+    Driver: 'driver',
+    Vehicle: 'vehicle',
+    Booking: 'booking',
+}
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Driver)
+@receiver(post_save, sender=Vehicle)
+@receiver(post_save, sender=Booking)
+def index_on_save(sender, instance, created, **kwargs):
+    entity_type = ENTITY_TYPES[sender]
+    object_id = instance.pk
+    transaction.on_commit(lambda: index_objects(entity_type, [object_id]))
+    # Booking documents carry customer and vehicle names
+    if not created and sender in (Customer, Vehicle):
+        lookup = 'customer_id' if sender is Customer else 'vehicle_id'
+        transaction.on_commit(lambda: index_objects(
+            'booking', Booking.objects.filter(**{lookup: object_id}).values_list('pk', flat=True)
+        ))
+
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=Booking)
+def remove_on_delete(sender, instance, **kwargs):
+    entity_type = ENTITY_TYPES[sender]
+    object_id = instance.pk
+    transaction.on_commit(lambda: remove_objects(entity_type, [object_id]))
+
+
+@receiver(bookings_marked_overdue)
+def index_on_overdue(sender, booking_ids, **kwargs):
+    # Booking documents show the status, which the sweeper changes in bulk
+    transaction.on_commit(lambda: index_objects('booking', booking_ids))
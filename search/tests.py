@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from bookings.models import Booking, Location
+from bookings.sweeper import mark_overdue
+from customers.models import Customer
+from drivers.models import Driver
+from vehicles.models import Vehicle, VehicleCategory, VehicleSubCategory
+from .indexing import index_objects, search
+
+
+def person(model, index, first_name, last_name):
+    return model(
+        first_name=first_name, last_name=last_name, email=f'{model.__name__.lower()}{index}@example.com',
+        contact_number=f'+9477{index:07d}', nic=f'{index:09d}V', nationality='Sri Lankan',
+        country='Sri Lanka', address='Colombo',
+        **({'user_name': f'customer{index}'} if model is Customer else {})
+    )
+
+
+class SearchTests(TestCase):
+
+    def index(self, model, people):
+        created = model.objects.bulk_create(people)
+        index_objects(model.__name__.lower(), [obj.pk for obj in created])
+        return created
+
+    def test_whole_word_matches_rank_above_prefix_matches(self):
+        kamala, kamal = self.index(Customer, [
+            person(Customer, 1, 'Kamala', 'Silva'),
+            person(Customer, 2, 'Kamal', 'Silva'),
+        ])
+
+        customers = search('kamal')['customers']
+
+        self.assertEqual([hit['id'] for hit in customers], [kamal.pk, kamala.pk])
+        self.assertGreater(customers[0]['score'], customers[1]['score'])
+
+    def test_every_query_word_must_match(self):
+        kamal, _ = self.index(Customer, [
+            person(Customer, 1, 'Kamal', 'Silva'),
+            person(Customer, 2, 'Kamal', 'Perera'),
+        ])
+
+        self.assertEqual([hit['id'] for hit in search('kam sil')['customers']], [kamal.pk])
+        self.assertEqual(search('kamal fernando')['customers'], [])
+
+    def test_results_are_limited_and_grouped_per_type(self):
+        # Many equally strong customers must not crowd the drivers out
+        self.index(Customer, [person(Customer, index, 'Nimal', 'Perera') for index in range(250)])
+        driver, = self.index(Driver, [person(Driver, 1, 'Nimal', 'Perera')])
+
+        results = search('perera', limit=3)
+
+        self.assertEqual(len(results['customers']), 3)
+        self.assertEqual([hit['id'] for hit in results['drivers']], [driver.pk])
+        self.assertEqual(results['vehicles'], [])
+        self.assertEqual(results['bookings'], [])
+
+    def test_swept_bookings_show_their_new_status(self):
+        category = VehicleCategory.objects.create(category_name='Car')
+        sub_category = VehicleSubCategory.objects.create(category=category, sub_category_name='Sedan')
+        vehicle = Vehicle.objects.create(
+            category=category, sub_category=sub_category, vehicle_name='Axio', engine_capacity=1500,
+            fuel_type='petrol', color='White', make='Toyota', model='Axio', transmission='auto',
+            price_per_day=Decimal('50.00'), no_of_seats=4, insurance_no='INS-1', insurance_expiry=date(2030, 1, 1),
+            registration_no='CAB-1234', vin='VIN-1', base_km_per_day=100, excess_km_charge=Decimal('1.50'),
+            registration_expiry=date(2030, 1, 1), deposit_amount=Decimal('100.00'), late_fee=Decimal('20.00'),
+        )
+        location = Location.objects.create(name='Colombo', address='Colombo')
+        customer = person(Customer, 1, 'Kamal', 'Silva')
+        customer.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.create(
+                booking_date=timezone.now() - timedelta(days=3), return_date=timezone.now() - timedelta(days=1),
+                pickup_location=location, dropoff_location=location, starting_odometer_reading=1000,
+                customer=customer, vehicle=vehicle, driving_type='self_drive', no_of_passengers=2,
+                fuel_responsibility='by_client', deposited_amount=Decimal('100.00'), insurance_type='general',
+                total_amount=Decimal('150.00'), status='ongoing',
+            )
+        self.assertTrue(search(str(booking.pk))['bookings'][0]['subtitle'].endswith('ongoing'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue()
+
+        self.assertTrue(search(str(booking.pk))['bookings'][0]['subtitle'].endswith('overdue'))
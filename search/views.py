@@ -0,0 +1,25 @@
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from .indexing import search
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+
+class SearchViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    
+    def list(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        
+        return Response({
+            'data': search(query, limit=max(limit, 0)),
+            'message': 'Search results retrieved successfully',
+            'status': 'success',
+            'code': 200
+        })
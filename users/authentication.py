@@ -1,6 +1,8 @@
 import jwt
 from datetime import datetime, timedelta
 from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import salted_hmac
 from rest_framework import authentication, exceptions
 from django.contrib.auth.models import User
 
@@ -21,8 +23,9 @@ class JWTAuthentication(authentication.BaseAuthentication):
             if not user_id:
                 return None
             
-            user = User.objects.get(id=user_id)
-            return (user, token)
+            if settings.JWT_STATELESS_AUTH:
+                return (user_from_claims(payload), token)
+            return (self.get_user(user_id, payload.get('ver')), token)
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed('Token has expired')
         except jwt.InvalidTokenError:
@@ -30,6 +33,27 @@ class JWTAuthentication(authentication.BaseAuthentication):
         except User.DoesNotExist:
             raise exceptions.AuthenticationFailed('User not found')
     
+    def get_user(self, user_id, version):
+        """
+        The token's user, cached in the ``shared`` cache for
+        ``JWT_USER_CACHE_TIMEOUT`` seconds so every worker sees a save drop
+        it. Users that no longer exist are cached too. Tokens carrying an
+        outdated ``ver`` claim, i.e. issued before a password change, are
+        refused against the cached user without another lookup. Tokens issued
+        without one are still accepted.
+        """
+        cache = caches['shared']
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = User.objects.filter(id=user_id).first() or USER_NOT_FOUND
+            cache.set(key, user, settings.JWT_USER_CACHE_TIMEOUT)
+        if user == USER_NOT_FOUND:
+            raise User.DoesNotExist
+        if version is not None and token_version(user) != version:
+            raise exceptions.AuthenticationFailed('Token has been revoked')
+        return user
+    
     def get_token_from_request(self, request):
         auth_header = request.META.get('HTTP_AUTHORIZATION')
         if auth_header and auth_header.startswith('Bearer '):
@@ -37,10 +61,55 @@ class JWTAuthentication(authentication.BaseAuthentication):
         return None
 
 
+# Cached in place of a user that does not exist
+USER_NOT_FOUND = 'not-found'
+
+
+def user_cache_key(user_id):
+    return f'jwt-user:{user_id}'
+
+
+def token_version(user):
+    """Changes whenever the user's password does, revoking older tokens."""
+    return salted_hmac('users.authentication.token_version', user.password).hexdigest()[:12]
+
+
+def user_from_claims(payload):
+    """
+    Unsaved ``User`` built from the token's claims, used instead of a lookup
+    with ``JWT_STATELESS_AUTH``. Reload it with ``database_user`` before
+    changing it.
+    """
+    user = User(
+        id=payload['id'],
+        username=payload.get('username', ''),
+        email=payload.get('email', ''),
+        first_name=payload.get('first_name', ''),
+        last_name=payload.get('last_name', ''),
+        is_staff=payload.get('is_staff', False),
+        is_superuser=payload.get('is_superuser', False),
+    )
+    user.from_token_claims = True
+    return user
+
+
+def database_user(user):
+    """``user`` as stored, reloaded when it was built from token claims."""
+    if getattr(user, 'from_token_claims', False):
+        return User.objects.get(pk=user.pk)
+    return user
+
+
 def generate_jwt_token(user):
     payload = {
         'id': user.id,
         'email': user.email,
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+        'ver': token_version(user),
         'iat': datetime.utcnow(),
         'exp': datetime.utcnow() + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
     }
@@ -0,0 +1,15 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache_key
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_authenticated_user(sender, instance, **kwargs):
+    # Covers password changes and profile updates alike
+    key = user_cache_key(instance.pk)
+    transaction.on_commit(lambda: caches['shared'].delete(key))
@@ -1,4 +1,72 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .authentication import generate_jwt_token
 
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'users-tests-{alias}'}
+    for alias in ('default', 'local', 'shared')
+}
+
+
+@override_settings(CACHES=TEST_CACHES, JWT_STATELESS_AUTH=False, JWT_USER_CACHE_TIMEOUT=60)
+class JWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.user = User.objects.create_user(username='nimal', email='nimal@example.com', password='old-secret')
+        self.client = APIClient()
+
+    # JWTAuthentication sends no WWW-Authenticate header, so refusals are 403s
+    def get_me(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return self.client.get('/api/users/')
+
+    def change_password(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/users/change_password/', {
+                'old_password': 'old-secret', 'new_password': 'new-secret', 'confirm_password': 'new-secret'
+            }, format='json')
+
+    def test_cached_user_is_reused(self):
+        token = generate_jwt_token(self.user)
+        self.assertEqual(self.get_me(token).status_code, 200)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_me(token).status_code, 200)
+
+    def test_change_password_revokes_older_tokens(self):
+        token = generate_jwt_token(self.user)
+        self.assertEqual(self.get_me(token).status_code, 200)
+
+        self.assertEqual(self.change_password(token).status_code, 200)
+
+        response = self.get_me(token)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(str(response.data['detail']), 'Token has been revoked')
+        # The refusal is answered from the cache
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_me(token).status_code, 403)
+
+    def test_change_password_returns_a_working_token(self):
+        response = self.change_password(generate_jwt_token(self.user))
+
+        fresh_token = response.data['data']['access_token']
+        me = self.get_me(fresh_token)
+        self.assertEqual(me.status_code, 200)
+        self.assertEqual(me.data['data']['username'], 'nimal')
+
+    def test_deleted_user_is_refused_from_the_cache(self):
+        token = generate_jwt_token(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+
+        self.assertEqual(self.get_me(token).status_code, 403)
+        with self.assertNumQueries(0):
+            response = self.get_me(token)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(str(response.data['detail']), 'User not found')
@@ -6,7 +6,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from .models import Document
 from .serializers import UserSerializer, LoginSerializer, PasswordChangeSerializer, DocumentSerializer
-from .authentication import generate_jwt_token
+from .authentication import database_user, generate_jwt_token
 import hashlib
 from django.core.files.base import ContentFile
 from django.conf import settings
@@ -20,11 +20,12 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
+        # Stateless auth hands out a user built from token claims
+        return database_user(self.request.user)
     
     def list(self, request, *args, **kwargs):
         # Return current user's details
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(self.get_object())
         return Response({
             'data': serializer.data,
             'message': 'Data received successfully',
@@ -34,7 +35,7 @@ class UserViewSet(viewsets.ModelViewSet):
     
     def retrieve(self, request, *args, **kwargs):
         # Return current user's details
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(self.get_object())
         return Response({
             'data': serializer.data,
             'message': 'Data received successfully',
@@ -44,7 +45,7 @@ class UserViewSet(viewsets.ModelViewSet):
     
     def update(self, request, *args, **kwargs):
         # Update current user's details
-        serializer = self.get_serializer(request.user, data=request.data, partial=True)
+        serializer = self.get_serializer(self.get_object(), data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         
@@ -84,7 +85,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = PasswordChangeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        user = request.user
+        user = self.get_object()
         old_password = serializer.validated_data['old_password']
         new_password = serializer.validated_data['new_password']
         
@@ -98,7 +99,11 @@ class UserViewSet(viewsets.ModelViewSet):
         user.set_password(new_password)
         user.save()
         
+        # Tokens issued before the change are revoked, hand out a new one
         return Response({
+            'data': {
+                'access_token': generate_jwt_token(user)
+            },
             'message': 'Password changed successfully',
             'status': 'success',
             'code': 200
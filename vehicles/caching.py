@@ -0,0 +1,10 @@
+from django.db import transaction
+
+from fleet360.caching import bump_version
+
+VEHICLE_LIST_NAMESPACE = 'vehicle-list'
+
+
+def invalidate_vehicle_list():
+    # After commit, so a concurrent read cannot cache the uncommitted state
+    transaction.on_commit(lambda: bump_version(VEHICLE_LIST_NAMESPACE, using='shared'))
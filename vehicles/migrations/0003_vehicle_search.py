@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_vehicles(apps, schema_editor):
+    from fleet360.normalization import normalize_registration
+    from vehicles.search import vehicle_tokens
+
+    Vehicle = apps.get_model('vehicles', 'Vehicle')
+    VehicleSearchToken = apps.get_model('vehicles', 'VehicleSearchToken')
+
+    vehicles = list(Vehicle.objects.all())
+    for vehicle in vehicles:
+        vehicle.registration_key = normalize_registration(vehicle.registration_no)
+    Vehicle.objects.bulk_update(vehicles, ['registration_key'], batch_size=1000)
+
+    if schema_editor.connection.vendor != 'mysql':
+        VehicleSearchToken.objects.bulk_create([
+            VehicleSearchToken(vehicle_id=vehicle.pk, token=token, weight=weight)
+            for vehicle in vehicles
+            for token, weight in vehicle_tokens(vehicle).items()
+        ], batch_size=1000)
+
+
+def add_fulltext_index(apps, schema_editor):
+    # n-gram parser so partial words and registration fragments match
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE vehicles ADD FULLTEXT INDEX vehicles_search_ft '
+            '(vehicle_name, make, model, registration_no, registration_key) WITH PARSER ngram'
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE vehicles DROP INDEX vehicles_search_ft')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicles', '0002_created_at_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='registration_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.CreateModel(
+            name='VehicleSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.IntegerField(default=1)),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='vehicles.vehicle')),
+            ],
+            options={
+                'db_table': 'vehicle_search_tokens',
+                'constraints': [models.UniqueConstraint(fields=('token', 'vehicle'), name='unique_vehicle_search_token')],
+            },
+        ),
+        migrations.RunPython(index_existing_vehicles, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
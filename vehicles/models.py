@@ -1,4 +1,11 @@
 from django.db import models
+from django.db.models import Q
+from fleet360.normalization import normalize_registration
+
+
+# Vehicles that may be rented out at all. The 'booked' status only reflects
+# the current booking, the bookings themselves decide which periods are free.
+RENTABLE_VEHICLES = Q(is_undermaintanace=False) & ~Q(status='maintenance')
 
 
 class VehicleCategory(models.Model):
@@ -58,6 +65,8 @@ class Vehicle(models.Model):
     insurance_no = models.CharField(max_length=100)
     insurance_expiry = models.DateField()
     registration_no = models.CharField(max_length=20, unique=True)
+    # registration_no without separators, for exact-match search
+    registration_key = models.CharField(max_length=20, db_index=True, editable=False, default='')
     vin = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True, null=True)
     base_km_per_day = models.IntegerField()
@@ -75,8 +84,24 @@ class Vehicle(models.Model):
     def __str__(self):
         return f"{self.make} {self.model} - {self.registration_no}"
     
+    @property
+    def is_rentable(self):
+        """Instance check matching ``RENTABLE_VEHICLES``."""
+        return not self.is_undermaintanace and self.status != 'maintenance'
+    
+    def save(self, *args, **kwargs):
+        self.registration_key = normalize_registration(self.registration_no)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'registration_no' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'registration_key'}
+        super().save(*args, **kwargs)
+    
     class Meta:
         db_table = 'vehicles'
+        # Keyset paging key, see fleet360.pagination
+        indexes = [
+            models.Index(fields=['created_at', 'vehicle_id'], name='vehicles_created_idx'),
+        ]
 
 
 class VehicleDocument(models.Model):
@@ -111,3 +136,23 @@ class VehicleImage(models.Model):
     
     class Meta:
         db_table = 'vehicle_images'
+
+
+class VehicleSearchToken(models.Model):
+    """
+    Words of a vehicle's searchable fields, used for search on databases
+    without a FULLTEXT index. Maintained by ``vehicles.search``.
+    """
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+    # Highest weight of the fields the word appears in
+    weight = models.IntegerField(default=1)
+    
+    def __str__(self):
+        return f"{self.vehicle_id} - {self.token}"
+    
+    class Meta:
+        db_table = 'vehicle_search_tokens'
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'vehicle'], name='unique_vehicle_search_token'),
+        ]
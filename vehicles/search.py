@@ -0,0 +1,99 @@
+import operator
+from functools import reduce
+
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.expressions import RawSQL
+
+from fleet360.normalization import normalize_registration, search_tokens
+from .models import VehicleSearchToken
+
+# Weight of a word by the field it appears in
+SEARCH_WEIGHTS = {
+    'registration_no': 4,
+    'make': 2,
+    'model': 2,
+    'vehicle_name': 1,
+}
+# Columns of the vehicles_search_ft FULLTEXT index on MySQL
+FULLTEXT_COLUMNS = ('vehicle_name', 'make', 'model', 'registration_no', 'registration_key')
+EXACT_REGISTRATION_BOOST = 1000
+REGISTRATION_PREFIX_BOOST = 100
+
+
+def uses_fulltext():
+    """MySQL searches its FULLTEXT index; other databases use the token table."""
+    return connection.vendor == 'mysql'
+
+
+def vehicle_tokens(vehicle):
+    """Map of search word to weight for ``vehicle``, including its separator-free registration."""
+    weights = {}
+    for field, weight in SEARCH_WEIGHTS.items():
+        for token in search_tokens(getattr(vehicle, field)):
+            token = token[:64]
+            weights[token] = max(weights.get(token, 0), weight)
+    registration_key = normalize_registration(vehicle.registration_no).lower()
+    if registration_key:
+        weights[registration_key] = SEARCH_WEIGHTS['registration_no']
+    return weights
+
+
+def index_vehicle(vehicle):
+    if uses_fulltext():
+        return
+    with transaction.atomic():
+        VehicleSearchToken.objects.filter(vehicle_id=vehicle.pk).delete()
+        VehicleSearchToken.objects.bulk_create([
+            VehicleSearchToken(vehicle_id=vehicle.pk, token=token, weight=weight)
+            for token, weight in vehicle_tokens(vehicle).items()
+        ])
+
+
+def _fulltext_relevance(queryset, tokens):
+    columns = ', '.join(f'vehicles.{column}' for column in FULLTEXT_COLUMNS)
+    against = ' '.join(f'+{token}' for token in tokens)
+    relevance = RawSQL(f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)', [against])
+    return queryset.annotate(search_relevance=relevance).filter(search_relevance__gt=0)
+
+
+def _token_relevance(queryset, tokens):
+    # Every query word must prefix some word of the vehicle; each prefix is a range scan
+    prefixes = reduce(operator.or_, (Q(token__startswith=token) for token in tokens))
+    matched = reduce(operator.add, (
+        Max(Case(When(token__startswith=token, then=Value(1)), default=Value(0)))
+        for token in tokens
+    ))
+    # Whole-word hits count double
+    relevance = Sum(Case(When(token__in=tokens, then=F('weight') * 2), default=F('weight')))
+    hits = VehicleSearchToken.objects.filter(prefixes).values('vehicle_id').annotate(
+        matched=matched, relevance=relevance
+    ).filter(matched=len(tokens))
+    return queryset.filter(pk__in=hits.values('vehicle_id')).annotate(
+        search_relevance=Subquery(hits.filter(vehicle_id=OuterRef('pk')).values('relevance')[:1])
+    )
+
+
+def search_vehicles(queryset, query):
+    """
+    Filter ``queryset`` to vehicles matching every word of ``query`` and
+    order them by relevance. A registration number equal to the query,
+    ignoring separators, ranks first, then registrations starting with it.
+    """
+    tokens = search_tokens(query)
+    if not tokens:
+        return queryset
+
+    if uses_fulltext():
+        queryset = _fulltext_relevance(queryset, tokens)
+    else:
+        queryset = _token_relevance(queryset, tokens)
+
+    registration_key = normalize_registration(query)
+    boost = Case(
+        When(registration_key=registration_key, then=Value(EXACT_REGISTRATION_BOOST)),
+        When(registration_key__startswith=registration_key, then=Value(REGISTRATION_PREFIX_BOOST)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    return queryset.annotate(search_rank=F('search_relevance') + boost).order_by('-search_rank', 'vehicle_id')
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from fleet360.reference_data import ReferenceRelatedField
 from .models import Vehicle, VehicleDocument, VehicleImage, VehicleCategory, VehicleSubCategory
 
 
@@ -27,6 +28,8 @@ class VehicleImageSerializer(serializers.ModelSerializer):
 
 
 class VehicleSerializer(serializers.ModelSerializer):
+    category = ReferenceRelatedField('category', queryset=VehicleCategory.objects.all())
+    sub_category = ReferenceRelatedField('sub_category', queryset=VehicleSubCategory.objects.all())
     documents = VehicleDocumentSerializer(many=True, required=False)
     vehicle_imgs = VehicleImageSerializer(many=True, required=False)
     
@@ -89,10 +92,23 @@ class VehicleStatusSerializer(serializers.ModelSerializer):
 class VehicleAvailabilitySerializer(serializers.ModelSerializer):
     class Meta:
         model = Vehicle
-        fields = ['vehicle_id', 'is_available']
+        fields = ['vehicle_id', 'is_available', 'conflicting_bookings', 'next_available_window']
     
     is_available = serializers.SerializerMethodField()
+    conflicting_bookings = serializers.SerializerMethodField()
+    next_available_window = serializers.SerializerMethodField()
     
     def get_is_available(self, obj):
-        # This would need to be implemented based on booking logic
-        return not obj.is_undermaintanace and obj.status == 'available'
+        # Falls back to the static flags when no booking period was checked
+        availability = self.context.get('availability')
+        if availability is None:
+            return not obj.is_undermaintanace and obj.status == 'available'
+        return availability['is_available']
+    
+    def get_conflicting_bookings(self, obj):
+        availability = self.context.get('availability')
+        return availability['conflicting_bookings'] if availability else []
+    
+    def get_next_available_window(self, obj):
+        availability = self.context.get('availability')
+        return availability['next_available_window'] if availability else None
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from fleet360.reference_data import invalidate_reference_data
+from .caching import invalidate_vehicle_list
+from .models import Vehicle, VehicleCategory, VehicleDocument, VehicleImage, VehicleSubCategory
+from .search import index_vehicle
+
+
+@receiver(post_save, sender=Vehicle)
+def update_search_tokens(sender, instance, **kwargs):
+    index_vehicle(instance)
+
+
+@receiver(post_save, sender=VehicleCategory)
+@receiver(post_delete, sender=VehicleCategory)
+@receiver(post_save, sender=VehicleSubCategory)
+@receiver(post_delete, sender=VehicleSubCategory)
+def invalidate_categories(sender, instance, **kwargs):
+    invalidate_reference_data()
+    # Category names are list filters
+    invalidate_vehicle_list()
+
+
+@receiver(post_save, sender=Vehicle)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_save, sender=VehicleDocument)
+@receiver(post_delete, sender=VehicleDocument)
+@receiver(post_save, sender=VehicleImage)
+@receiver(post_delete, sender=VehicleImage)
+def invalidate_vehicles(sender, instance, **kwargs):
+    invalidate_vehicle_list()
+
+
+@receiver(post_save, sender=VehicleDocument)
+@receiver(post_delete, sender=VehicleDocument)
+@receiver(post_save, sender=VehicleImage)
+@receiver(post_delete, sender=VehicleImage)
+def touch_vehicle(sender, instance, **kwargs):
+    # Nested rows are part of the vehicle's representation, whose cached
+    # fragments and ETags are keyed by its updated_at
+    Vehicle.objects.filter(pk=instance.vehicle_id).update(updated_at=timezone.now())
@@ -1,3 +1,258 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, Location
+from customers.models import Customer
+from .models import Vehicle, VehicleCategory, VehicleDocument, VehicleImage, VehicleSubCategory
+from .serializers import VehicleSerializer
+
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'vehicles-tests-{alias}'}
+    for alias in ('default', 'local', 'shared')
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class VehicleTestCase(TestCase):
+    """An authenticated client, a customer and location to book with, and a helper to create vehicles."""
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.user = User.objects.create_user(username='fleet', email='fleet@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.category = VehicleCategory.objects.create(category_name='Car')
+        self.sub_category = VehicleSubCategory.objects.create(category=self.category, sub_category_name='Sedan')
+        self.location = Location.objects.create(name='Colombo', address='Colombo')
+        self.customer = Customer.objects.create(
+            first_name='John', last_name='Doe', user_name='johndoe', email='john.doe@example.com',
+            contact_number='+94771234567', address='Colombo', nic='123456789V',
+            nationality='Sri Lankan', country='Sri Lanka'
+        )
+
+    def vehicle(self, index, **kwargs):
+        fields = dict(
+            category=self.category, sub_category=self.sub_category, vehicle_name=f'Axio {index}',
+            engine_capacity=1500, fuel_type='petrol', color='White', make='Toyota', model='Axio',
+            transmission='auto', price_per_day=Decimal('50.00'), no_of_seats=4, insurance_no=f'INS-{index}',
+            insurance_expiry=date(2030, 1, 1), registration_no=f'CAB-{1000 + index}', vin=f'VIN-{index}',
+            base_km_per_day=100, excess_km_charge=Decimal('1.50'), registration_expiry=date(2030, 1, 1),
+            deposit_amount=Decimal('100.00'), late_fee=Decimal('20.00'),
+        )
+        fields.update(kwargs)
+        return Vehicle.objects.create(**fields)
+
+    def book(self, vehicle, start, end):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                booking_date=start, return_date=end, pickup_location=self.location, dropoff_location=self.location,
+                starting_odometer_reading=1000, customer=self.customer, vehicle=vehicle, driving_type='self_drive',
+                no_of_passengers=2, fuel_responsibility='by_client', deposited_amount=Decimal('100.00'),
+                insurance_type='general', total_amount=Decimal('150.00'), status='ongoing',
+            )
+
+
+class RentableVehicleTests(VehicleTestCase):
+    """
+    The list period filter, quotes and the status check agree on which
+    vehicles can be rented: anything not under maintenance, whatever its
+    current booking status.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.rentable = self.vehicle(1)
+        # Out on a booking that ends before the periods asked about
+        self.booked = self.vehicle(2, status='booked')
+        self.book(self.booked, timezone.now() - timedelta(days=1), timezone.now() + timedelta(days=1))
+        self.in_workshop = self.vehicle(3, is_undermaintanace=True)
+        self.retired = self.vehicle(4, status='maintenance')
+        start = timezone.localdate() + timedelta(days=3)
+        self.period = {'available_from': start.isoformat(), 'available_to': (start + timedelta(days=2)).isoformat()}
+
+    def test_period_filter_lists_only_rentable_vehicles(self):
+        response = self.client.get('/api/vehicles/', self.period)
+
+        self.assertEqual(
+            sorted(item['vehicle_id'] for item in response.json()['data']), [self.rentable.pk, self.booked.pk]
+        )
+
+    def test_quote_prices_only_rentable_vehicles(self):
+        start = timezone.now() + timedelta(days=3)
+        response = self.client.post('/api/vehicles/quote/', {
+            'booking_date': start.isoformat(), 'return_date': (start + timedelta(days=2)).isoformat(),
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(quote['vehicle_id'] for quote in response.data['data']['quotes']), [self.rentable.pk, self.booked.pk]
+        )
+
+    def test_vehicle_returned_in_the_morning_is_offered_that_afternoon(self):
+        day = timezone.localdate() + timedelta(days=5)
+
+        def at(hour):
+            return timezone.make_aware(datetime.combine(day, time(hour)))
+
+        self.book(self.rentable, at(10) - timedelta(days=2), at(10))
+
+        def listed(start):
+            period = {'available_from': start.isoformat(), 'available_to': (start + timedelta(days=1)).isoformat()}
+            return self.rentable.pk in [item['vehicle_id'] for item in self.client.get('/api/vehicles/', period).json()['data']]
+
+        def quoted(start):
+            response = self.client.post('/api/vehicles/quote/', {
+                'booking_date': start.isoformat(), 'return_date': (start + timedelta(days=1)).isoformat(),
+            }, format='json')
+            return self.rentable.pk in [quote['vehicle_id'] for quote in response.data['data']['quotes']]
+
+        self.assertTrue(listed(at(14)))
+        self.assertTrue(quoted(at(14)))
+        self.assertFalse(listed(at(9)))
+        self.assertFalse(quoted(at(9)))
+
+    def test_status_check_refuses_vehicles_that_are_not_rentable(self):
+        for vehicle, expected in (
+            (self.rentable, True), (self.booked, True), (self.in_workshop, False), (self.retired, False)
+        ):
+            response = self.client.get(f'/api/vehicles/{vehicle.pk}/status/', self.period)
+            self.assertEqual(response.data['data']['is_available'], expected)
+
+
+class ConditionalGetTests(VehicleTestCase):
+
+    def test_unchanged_vehicle_is_answered_with_304(self):
+        vehicle = self.vehicle(1)
+        url = f'/api/vehicles/{vehicle.pk}/'
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+        self.assertEqual(revalidated['ETag'], first['ETag'])
+
+        vehicle.color = 'Black'
+        vehicle.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_list_etag_changes_when_a_row_leaves_the_filter(self):
+        booked, latest = self.vehicle(1), self.vehicle(2)
+        start = timezone.localdate() + timedelta(days=3)
+        period = {'available_from': start.isoformat(), 'available_to': (start + timedelta(days=1)).isoformat()}
+        first = self.client.get('/api/vehicles/', period)
+        self.assertEqual(self.client.get('/api/vehicles/', period, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        # The vehicle leaving the list is not the latest updated one
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(
+                booking_date=timezone.make_aware(datetime.combine(start, time(10))),
+                return_date=timezone.make_aware(datetime.combine(start + timedelta(days=1), time(10))),
+                pickup_location=self.location, dropoff_location=self.location, starting_odometer_reading=1000,
+                customer=self.customer, vehicle=booked, driving_type='self_drive', no_of_passengers=2,
+                fuel_responsibility='by_client', deposited_amount=Decimal('100.00'), insurance_type='general',
+                total_amount=Decimal('150.00'),
+            )
+
+        response = self.client.get('/api/vehicles/', period, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual([item['vehicle_id'] for item in response.json()['data']], [latest.pk])
+
+
+class ResponseCacheTests(VehicleTestCase):
+
+    def test_hit_replays_the_stored_body_and_headers(self):
+        self.vehicle(1)
+        first = self.client.get('/api/vehicles/', {'fuel_type': 'petrol'})
+
+        with self.assertNumQueries(0):
+            hit = self.client.get('/api/vehicles/', {'fuel_type': ' Petrol '})
+        self.assertEqual(hit.status_code, 200)
+        self.assertEqual(hit.content, first.content)
+        for header in ('ETag', 'Last-Modified', 'Cache-Control'):
+            self.assertEqual(hit[header], first[header])
+
+        with self.assertNumQueries(0):
+            revalidated = self.client.get('/api/vehicles/', {'fuel_type': 'petrol'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_vehicle_change_invalidates_cached_pages(self):
+        vehicle = self.vehicle(1)
+        first = self.client.get('/api/vehicles/')
+
+        vehicle.vehicle_name = 'Premio'
+        with self.captureOnCommitCallbacks(execute=True):
+            vehicle.save()
+
+        response = self.client.get('/api/vehicles/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.json()['data'][0]['vehicle_name'], 'Premio')
+
+    def test_unlisted_params_are_not_cached(self):
+        self.vehicle(1)
+        first = self.client.get('/api/vehicles/', {'ordering': 'vehicle_name'})
+
+        # Rendered again: fingerprint, count and page
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get('/api/vehicles/', {'ordering': 'vehicle_name'}).content, first.content)
+        # The fingerprint alone answers a revalidation
+        with self.assertNumQueries(1):
+            self.client.get('/api/vehicles/', {'ordering': 'vehicle_name'}, HTTP_IF_NONE_MATCH=first['ETag'])
+
+
+class VehicleFragmentTests(VehicleTestCase):
+
+    def drop_page_caches(self):
+        # Keep the per-vehicle fragments in ``default``, forget rendered pages
+        caches['local'].clear()
+        caches['shared'].clear()
+
+    def test_spliced_page_matches_the_json_renderer(self):
+        first = self.vehicle(1, vehicle_name='Axio ශ්‍රී', description='"Quoted" & <escaped>')
+        self.vehicle(2, price_per_day=Decimal('72.50'))
+        VehicleImage.objects.create(vehicle=first, image_hash='abc', image_url='https://example.com/a.jpg')
+
+        for _ in range(2):
+            # Rendered from fresh fragments, then from cached ones
+            response = self.client.get('/api/vehicles/')
+            payload = response.json()
+            vehicles = Vehicle.objects.in_bulk([item['vehicle_id'] for item in payload['data']])
+            payload['data'] = VehicleSerializer(
+                [vehicles[item['vehicle_id']] for item in payload['data']], many=True
+            ).data
+            self.assertEqual(response.content, JSONRenderer().render(payload))
+            self.drop_page_caches()
+
+    def test_document_and_image_changes_refresh_the_fragment(self):
+        vehicle = self.vehicle(1)
+        self.assertEqual(self.client.get('/api/vehicles/').json()['data'][0]['documents'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            VehicleDocument.objects.create(vehicle=vehicle, document_type='insurance', document_hash='doc')
+        self.drop_page_caches()
+        data = self.client.get('/api/vehicles/').json()['data'][0]
+        self.assertEqual([document['document_hash'] for document in data['documents']], ['doc'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = VehicleImage.objects.create(vehicle=vehicle, image_hash='img')
+        self.drop_page_caches()
+        self.assertEqual(self.client.get('/api/vehicles/').json()['data'][0]['vehicle_imgs'][0]['image_hash'], 'img')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.drop_page_caches()
+        self.assertEqual(self.client.get('/api/vehicles/').json()['data'][0]['vehicle_imgs'], [])
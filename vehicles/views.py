@@ -1,9 +1,24 @@
+from decimal import Decimal
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.db.models import Q
-from .models import Vehicle, VehicleCategory, VehicleSubCategory
+from bookings.availability import check_vehicle_availability, parse_period
+from bookings.occupancy import busy_vehicle_ids
+from bookings.pricing import PRICING_FIELDS, quote_vehicles, rental_days
+from bookings.serializers import BookingQuoteSerializer
+from fleet360.conditional import conditional_get
+from fleet360.exports import StreamingExportMixin
+from fleet360.fragments import render_fragments, spliced_response
+from fleet360.reference_data import reference_data
+from fleet360.response_cache import cache_response
+from .caching import VEHICLE_LIST_NAMESPACE
+from .models import RENTABLE_VEHICLES, Vehicle, VehicleCategory, VehicleSubCategory
+from .search import search_vehicles
 from .serializers import (
     VehicleSerializer, VehicleStatusSerializer, 
     VehicleAvailabilitySerializer, VehicleCategorySerializer,
@@ -11,10 +26,26 @@ from .serializers import (
 )
 
 
-class VehicleViewSet(viewsets.ModelViewSet):
+class VehicleViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Vehicle.objects.all()
     serializer_class = VehicleSerializer
     permission_classes = [IsAuthenticated]
+    export_filename = 'vehicles'
+    export_fields = [
+        'vehicle_id', 'vehicle_name', 'category__category_name', 'sub_category__sub_category_name',
+        'make', 'model', 'registration_no', 'vin', 'fuel_type', 'transmission', 'engine_capacity',
+        'color', 'no_of_seats', 'price_per_day', 'base_km_per_day', 'excess_km_charge', 'deposit_amount',
+        'vat_amount', 'late_fee', 'odometer_reading', 'insurance_no', 'insurance_expiry',
+        'registration_expiry', 'status', 'is_undermaintanace', 'created_at'
+    ]
+    
+    # Catalogue pages are shared across users; other params such as the
+    # booking-dependent availability period bypass the cache
+    response_cache_namespace = VEHICLE_LIST_NAMESPACE
+    response_cache_params = (
+        'query', 'category', 'sub_category', 'fuel_type', 'available', 'page', 'page_size', 'count'
+    )
+    response_cache_timeout = settings.VEHICLE_LIST_CACHE_TIMEOUT
     
     def get_queryset(self):
         queryset = Vehicle.objects.all()
@@ -23,20 +54,18 @@ class VehicleViewSet(viewsets.ModelViewSet):
         sub_category = self.request.query_params.get('sub_category', None)
         fuel_type = self.request.query_params.get('fuel_type', None)
         available = self.request.query_params.get('available', None)
+        available_from = self.request.query_params.get('available_from', None)
+        available_to = self.request.query_params.get('available_to', None)
         
         if query:
-            queryset = queryset.filter(
-                Q(vehicle_name__icontains=query) |
-                Q(make__icontains=query) |
-                Q(model__icontains=query) |
-                Q(registration_no__icontains=query)
-            )
+            queryset = search_vehicles(queryset, query)
         
+        # Names resolve to ids through the reference-data cache, no join needed
         if category:
-            queryset = queryset.filter(category__category_name__iexact=category)
+            queryset = queryset.filter(category_id__in=reference_data().category_ids(category))
         
         if sub_category:
-            queryset = queryset.filter(sub_category__sub_category_name__iexact=sub_category)
+            queryset = queryset.filter(sub_category_id__in=reference_data().sub_category_ids(sub_category))
         
         if fuel_type:
             queryset = queryset.filter(fuel_type__iexact=fuel_type)
@@ -47,6 +76,16 @@ class VehicleViewSet(viewsets.ModelViewSet):
             elif available.lower() == 'false':
                 queryset = queryset.filter(Q(is_undermaintanace=True) | ~Q(status='available'))
         
+        # Detail routes such as status read the period themselves
+        if available_from and available_to and not self.detail:
+            try:
+                start, end = parse_period(available_from, available_to)
+            except ValueError as e:
+                raise ValidationError({'available_from': [str(e)]})
+            queryset = queryset.filter(RENTABLE_VEHICLES).exclude(
+                pk__in=busy_vehicle_ids(start, end)
+            )
+        
         return queryset
     
     # def create(self, request, *args, **kwargs):
@@ -69,27 +108,18 @@ class VehicleViewSet(viewsets.ModelViewSet):
         sub_category_id = data.pop('sub_category_id', None)
 
         if category_id is not None:
-            try:
-                category = VehicleCategory.objects.get(pk=category_id)
-                data['category'] = category.pk  # let serializer accept PK
-            except VehicleCategory.DoesNotExist:
+            category = reference_data().category(category_id)
+            if category is None:
                 return Response({
                     'message': 'Invalid category_id',
                     'status': 'error',
                     'code': 400
                 }, status=status.HTTP_400_BAD_REQUEST)
+            data['category'] = category.pk  # let serializer accept PK
 
         if sub_category_id is not None:
-            try:
-                sub_category = VehicleSubCategory.objects.get(pk=sub_category_id)
-
-                if sub_category.category != category:
-                    return Response({
-                        'message': 'Invalid sub_category_id',
-                        'status': 'error',
-                        'code': 400
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            except VehicleSubCategory.DoesNotExist:
+            sub_category = reference_data().sub_category(sub_category_id)
+            if sub_category is None or sub_category.category_id != category.pk:
                 return Response({
                     'message': 'Invalid sub_category_id',
                     'status': 'error',
@@ -119,34 +149,32 @@ class VehicleViewSet(viewsets.ModelViewSet):
         category = None  # Initialize category variable
 
         if category_id is not None:
-            try:
-                category = VehicleCategory.objects.get(pk=category_id)
-                data['category'] = category.pk  # let serializer accept PK
-            except VehicleCategory.DoesNotExist:
+            category = reference_data().category(category_id)
+            if category is None:
                 return Response({
                     'message': 'Invalid category_id',
                     'status': 'error',
                     'code': 400
                 }, status=status.HTTP_400_BAD_REQUEST)
+            data['category'] = category.pk  # let serializer accept PK
 
         if sub_category_id is not None:
-            try:
-                sub_category = VehicleSubCategory.objects.get(pk=sub_category_id)
-
-                # Only validate if category was provided in this request
-                if category is not None and sub_category.category != category:
-                    return Response({
-                        'message': 'Sub-category does not belong to the specified category',
-                        'status': 'error',
-                        'code': 400
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            except VehicleSubCategory.DoesNotExist:
+            sub_category = reference_data().sub_category(sub_category_id)
+            if sub_category is None:
                 return Response({
                     'message': 'Invalid sub_category_id',
                     'status': 'error',
                     'code': 400
                 }, status=status.HTTP_400_BAD_REQUEST)
 
+            # Only validate if category was provided in this request
+            if category is not None and sub_category.category_id != category.pk:
+                return Response({
+                    'message': 'Sub-category does not belong to the specified category',
+                    'status': 'error',
+                    'code': 400
+                }, status=status.HTTP_400_BAD_REQUEST)
+
             data['sub_category'] = sub_category.pk
 
         partial = kwargs.pop('partial', False)
@@ -174,11 +202,23 @@ class VehicleViewSet(viewsets.ModelViewSet):
             'message': f'vehicle {instance.vehicle_id} deleted successfully'
         })
     
+    @cache_response
+    @conditional_get
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
         
         if page is not None:
+            if request.accepted_renderer.format == 'json':
+                # Splice cached per-vehicle JSON instead of serializing the page
+                fragments = render_fragments(
+                    self.get_serializer_class(), page, self.get_serializer_context(),
+                    prefetch=('documents', 'vehicle_imgs')
+                )
+                envelope = self.get_paginated_response([]).data
+                envelope.update(message='User retrieved successfully', status='success', code=200)
+                return spliced_response(envelope, 'data', fragments)
+            
             serializer = self.get_serializer(page, many=True)
             paginated_response = self.get_paginated_response(serializer.data)
             paginated_response.data['message'] = 'User retrieved successfully'
@@ -194,6 +234,7 @@ class VehicleViewSet(viewsets.ModelViewSet):
             'code': 200
         })
     
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -228,14 +269,24 @@ class VehicleViewSet(viewsets.ModelViewSet):
             available_from = request.query_params.get('available_from', None)
             available_to = request.query_params.get('available_to', None)
             
-            if not available_from and not available_to:
+            if not available_from or not available_to:
                 return Response({
                     'message': 'Available from and available to are required',
                     'status': 'error',
                     'code': 400
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            serializer = VehicleAvailabilitySerializer(vehicle)
+            try:
+                start, end = parse_period(available_from, available_to)
+            except ValueError as e:
+                return Response({
+                    'message': str(e),
+                    'status': 'error',
+                    'code': 400
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            availability = check_vehicle_availability(vehicle, start, end)
+            serializer = VehicleAvailabilitySerializer(vehicle, context={'availability': availability})
             
             return Response({
                 'data': serializer.data,
@@ -243,11 +294,42 @@ class VehicleViewSet(viewsets.ModelViewSet):
                 'status': 'success',
                 'code': 200
             })
+    
+    @action(detail=False, methods=['post'])
+    def quote(self, request):
+        serializer = BookingQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        start, end = params['booking_date'], params['return_date']
         
-
+        # Candidates honour the list filters and must be free for the period
+        queryset = self.filter_queryset(self.get_queryset()).filter(RENTABLE_VEHICLES).exclude(
+            pk__in=busy_vehicle_ids(start, end)
+        )
+        if params.get('vehicle_ids'):
+            queryset = queryset.filter(pk__in=params['vehicle_ids'])
         
+        quotes = quote_vehicles(
+            queryset.values(*PRICING_FIELDS),
+            start,
+            end,
+            expected_km=params['expected_km'],
+            add_ons_total=sum((add_on['add_on_price'] for add_on in params.get('add_ons', [])), Decimal('0.00')),
+            discount_type=params.get('discount_type'),
+            discount=params.get('discount'),
+            insurance_value=params.get('insurance_value'),
+            is_vat_applicable=params['is_vat_applicable'],
+        )
         
-    
+        return Response({
+            'data': {
+                'rental_days': rental_days(start, end),
+                'quotes': quotes
+            },
+            'message': 'Vehicle quotes calculated successfully',
+            'status': 'success',
+            'code': 200
+        })
 
 
 class VehicleCategoryViewSet(viewsets.ReadOnlyModelViewSet):